@@ -22,6 +22,10 @@ from utils.cli_utils import create_progress, print_results_table
 from ai_wrapper.ollama_wrapper import OllamaWrapper
 
 class CVECollector:
+    # Seconds allowed per request (the Exploit-DB CSV is large) and per TCP connect
+    HTTP_TIMEOUT = 300
+    CONNECT_TIMEOUT = 15
+
     def __init__(self, base_dir: Path, ai_wrapper: Optional[OllamaWrapper] = None):
         self.base_dir = base_dir
         self.console = Console()
@@ -42,6 +46,34 @@ class CVECollector:
         # Load API keys if available
         self.api_keys = self._load_api_keys()
         
+        # One pooled HTTP session per collector, created on first use
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Shared session so keep-alive connections and DNS lookups are reused across fetches"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=100, limit_per_host=64, ttl_dns_cache=300, use_dns_cache=True
+            )
+            # A stalled feed must not hang the collector indefinitely
+            timeout = aiohttp.ClientTimeout(
+                total=self.HTTP_TIMEOUT, sock_connect=self.CONNECT_TIMEOUT
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self._session
+        
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        
+    async def __aenter__(self):
+        return self
+        
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+        
     def _load_api_keys(self) -> Dict[str, str]:
         """Load API keys from config"""
         try:
@@ -120,26 +152,26 @@ class CVECollector:
         if "nvd" in self.api_keys:
             params["apiKey"] = self.api_keys["nvd"]
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                await self._wait_for_rate_limit("nvd")
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        cves = data.get("vulnerabilities", [])
-                        await self._save_to_cache(cache_path, cves)
-                        return cves
-                    elif response.status == 429:  # Rate limit exceeded
-                        self.logger.warning("NVD rate limit exceeded. Waiting...")
-                        await asyncio.sleep(60)
-                        return await self.fetch_nvd_feed(start_date)
-                    else:
-                        self.logger.error("NVD API error: %s", response.status)
-                        return []
-            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
-                self.logger.error("Error fetching NVD feed: %s", e)
-                return []
-                
+        session = self._get_session()
+        try:
+            await self._wait_for_rate_limit("nvd")
+            async with session.get(url, params=params) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    cves = data.get("vulnerabilities", [])
+                    await self._save_to_cache(cache_path, cves)
+                    return cves
+                elif response.status == 429:  # Rate limit exceeded
+                    self.logger.warning("NVD rate limit exceeded. Waiting...")
+                    await asyncio.sleep(60)
+                    return await self.fetch_nvd_feed(start_date)
+                else:
+                    self.logger.error("NVD API error: %s", response.status)
+                    return []
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.error("Error fetching NVD feed: %s", e)
+            return []
+            
     async def fetch_exploit_db(self) -> List[Dict]:
         """Fetch exploit data from Exploit-DB"""
         self.console.print("[bold blue]Fetching Exploit-DB data...[/bold blue]")
@@ -152,43 +184,43 @@ class CVECollector:
             
         url = "https://raw.githubusercontent.com/offensive-security/exploitdb/master/files_exploits.csv"
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        content = await response.text()
-                        exploits = []
-                        
-                        # Parse CSV content
-                        for line in content.splitlines()[1:]:  # Skip header
-                            try:
-                                parts = line.split(',')
-                                if len(parts) >= 4:
-                                    # Extract CVE IDs from description
-                                    cve_ids = re.findall(r'CVE-\d{4}-\d+', parts[2])
-                                    
-                                    exploits.append({
-                                        "id": parts[0],
-                                        "file": parts[1],
-                                        "description": parts[2],
-                                        "date": parts[3],
-                                        "author": parts[4] if len(parts) > 4 else "Unknown",
-                                        "platform": parts[5] if len(parts) > 5 else "Unknown",
-                                        "type": parts[6] if len(parts) > 6 else "Unknown",
-                                        "cve_ids": cve_ids
-                                    })
-                            except:
-                                continue
+        session = self._get_session()
+        try:
+            async with session.get(url) as response:
+                if response.status == 200:
+                    content = await response.text()
+                    exploits = []
+                    
+                    # Parse CSV content
+                    for line in content.splitlines()[1:]:  # Skip header
+                        try:
+                            parts = line.split(',')
+                            if len(parts) >= 4:
+                                # Extract CVE IDs from description
+                                cve_ids = re.findall(r'CVE-\d{4}-\d+', parts[2])
                                 
-                        await self._save_to_cache(cache_path, exploits)
-                        return exploits
-                    else:
-                        self.logger.error("Exploit-DB fetch error: %s", response.status)
-                        return []
-            except Exception as e:
-                self.logger.error("Error fetching Exploit-DB: %s", e)
-                return []
-                
+                                exploits.append({
+                                    "id": parts[0],
+                                    "file": parts[1],
+                                    "description": parts[2],
+                                    "date": parts[3],
+                                    "author": parts[4] if len(parts) > 4 else "Unknown",
+                                    "platform": parts[5] if len(parts) > 5 else "Unknown",
+                                    "type": parts[6] if len(parts) > 6 else "Unknown",
+                                    "cve_ids": cve_ids
+                                })
+                        except:
+                            continue
+                            
+                    await self._save_to_cache(cache_path, exploits)
+                    return exploits
+                else:
+                    self.logger.error("Exploit-DB fetch error: %s", response.status)
+                    return []
+        except Exception as e:
+            self.logger.error("Error fetching Exploit-DB: %s", e)
+            return []
+            
     async def fetch_github_pocs(self, cve_id: str) -> List[Dict]:
         """Search for PoCs on GitHub"""
         self.console.print(f"[bold blue]Searching GitHub for {cve_id} PoCs...[/bold blue]")
@@ -211,52 +243,52 @@ class CVECollector:
         if "github" in self.api_keys:
             headers["Authorization"] = f"token {self.api_keys['github']}"
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                await self._wait_for_rate_limit("github")
-                async with session.get(url, params={"q": query}, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        results = data.get("items", [])
-                        
-                        # Process results
-                        processed_results = []
-                        for result in results:
-                            try:
-                                # Get file content
-                                content_url = result["url"]
-                                async with session.get(content_url, headers=headers) as content_response:
-                                    if content_response.status == 200:
-                                        content_data = await content_response.json()
-                                        content = content_data.get("content", "")
-                                        
-                                        # Extract relevant information
-                                        processed_results.append({
-                                            "repository": result["repository"]["full_name"],
-                                            "file_path": result["path"],
-                                            "url": result["html_url"],
-                                            "content": content,
-                                            "language": result.get("language", "Unknown"),
-                                            "stars": result["repository"].get("stargazers_count", 0),
-                                            "forks": result["repository"].get("forks_count", 0)
-                                        })
-                            except Exception as e:
-                                self.logger.warning("Error processing GitHub result: %s", e)
-                                continue
-                                
-                        await self._save_to_cache(cache_path, processed_results)
-                        return processed_results
-                    elif response.status == 403:  # Rate limit exceeded
-                        self.logger.warning("GitHub rate limit exceeded. Waiting...")
-                        await asyncio.sleep(3600)  # Wait 1 hour
-                        return await self.fetch_github_pocs(cve_id)
-                    else:
-                        self.logger.error("GitHub API error: %s", response.status)
-                        return []
-            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
-                self.logger.error("Error searching GitHub: %s", e)
-                return []
-                
+        session = self._get_session()
+        try:
+            await self._wait_for_rate_limit("github")
+            async with session.get(url, params={"q": query}, headers=headers) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    results = data.get("items", [])
+                    
+                    # Process results
+                    processed_results = []
+                    for result in results:
+                        try:
+                            # Get file content
+                            content_url = result["url"]
+                            async with session.get(content_url, headers=headers) as content_response:
+                                if content_response.status == 200:
+                                    content_data = await content_response.json()
+                                    content = content_data.get("content", "")
+                                    
+                                    # Extract relevant information
+                                    processed_results.append({
+                                        "repository": result["repository"]["full_name"],
+                                        "file_path": result["path"],
+                                        "url": result["html_url"],
+                                        "content": content,
+                                        "language": result.get("language", "Unknown"),
+                                        "stars": result["repository"].get("stargazers_count", 0),
+                                        "forks": result["repository"].get("forks_count", 0)
+                                    })
+                        except Exception as e:
+                            self.logger.warning("Error processing GitHub result: %s", e)
+                            continue
+                            
+                    await self._save_to_cache(cache_path, processed_results)
+                    return processed_results
+                elif response.status == 403:  # Rate limit exceeded
+                    self.logger.warning("GitHub rate limit exceeded. Waiting...")
+                    await asyncio.sleep(3600)  # Wait 1 hour
+                    return await self.fetch_github_pocs(cve_id)
+                else:
+                    self.logger.error("GitHub API error: %s", response.status)
+                    return []
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.error("Error searching GitHub: %s", e)
+            return []
+            
     async def analyze_cve(self, cve_data: Dict) -> Dict:
         """Analyze CVE data using AI"""
         if not self.ai_wrapper:
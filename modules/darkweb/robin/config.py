@@ -31,3 +31,6 @@ ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL")
 OLLAMA_MAIN_MODEL = os.getenv("OLLAMA_MAIN_MODEL")
 OLLAMA_ASSISTANT_MODEL = os.getenv("OLLAMA_ASSISTANT_MODEL")
+
+# Set to any non-empty value to bypass the on-disk LLM response cache
+DISABLE_LLM_CACHE = bool(os.getenv("VULNFORGE_DISABLE_LLM_CACHE"))
@@ -4,6 +4,7 @@ import re
 import logging
 import openai
 import warnings
+from langchain_core.messages import SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
@@ -12,12 +13,14 @@ try:
     from .llm_utils import (
         resolve_model_config,
         _common_llm_params,
+        BufferedStreamingHandler,
         get_model_choices,
     )
 except ImportError:
     from llm_utils import (
         resolve_model_config,
         _common_llm_params,
+        BufferedStreamingHandler,
         get_model_choices,
     )
 
@@ -40,7 +43,11 @@ def get_llm(model_choice):
 
     # Combine common parameters with model-specific parameters
     # Model-specific parameters will override common ones if there are any conflicts
-    all_params = {**_common_llm_params, **model_specific_params}
+    all_params = {
+        **_common_llm_params,
+        "callbacks": [BufferedStreamingHandler(buffer_limit=60)],
+        **model_specific_params,
+    }
 
     # Create the LLM instance using the gathered parameters
     llm_instance = llm_class(**all_params)
@@ -48,6 +55,21 @@ def get_llm(model_choice):
     return llm_instance
 
 
+def _system_message(llm, text):
+    """
+    Build the static system message that leads every prompt.
+
+    Keeping instructions free of per-run values makes the prefix byte-identical
+    across calls so provider-side prompt caching can reuse it; Anthropic needs
+    an explicit cache breakpoint for that.
+    """
+    if type(llm).__name__ == "ChatAnthropic":
+        return SystemMessage(
+            content=[{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
+        )
+    return SystemMessage(content=text)
+
+
 def refine_query(llm, user_input):
     system_prompt = """
     You are a Cybercrime Threat Intelligence Expert. Your task is to refine the provided user query that needs to be sent to darkweb search engines. 
@@ -61,32 +83,39 @@ def refine_query(llm, user_input):
     INPUT:
     """
     prompt_template = ChatPromptTemplate(
-        [("system", system_prompt), ("user", "{query}")]
+        [_system_message(llm, system_prompt), ("user", "{query}")]
     )
     chain = prompt_template | llm | StrOutputParser()
     return chain.invoke({"query": user_input})
 
 
-def filter_results(llm, query, results):
-    if not results:
-        return []
+# Most results filter_results keeps (matches the "Top 20" in its prompt)
+FILTER_TOP_N = 20
 
-    system_prompt = """
+_FILTER_SYSTEM_PROMPT = """
     You are a Cybercrime Threat Intelligence Expert. You are given a dark web search query and a list of search results in the form of index, link and title. 
     Your task is select the Top 20 relevant results that best match the search query for user to investigate more.
     Rule:
     1. Output ONLY atmost top 20 indices (comma-separated list) no more than that that best match the input query
-
-    Search Query: {query}
-    Search Results:
     """
 
-    final_str = _generate_final_string(results)
 
+def _filter_chain(llm):
     prompt_template = ChatPromptTemplate(
-        [("system", system_prompt), ("user", "{results}")]
+        [
+            _system_message(llm, _FILTER_SYSTEM_PROMPT),
+            ("user", "Search Query: {query}\nSearch Results:\n{results}"),
+        ]
     )
-    chain = prompt_template | llm | StrOutputParser()
+    return prompt_template | llm | StrOutputParser()
+
+
+def filter_results(llm, query, results):
+    if not results:
+        return []
+
+    chain = _filter_chain(llm)
+    final_str = _generate_final_string(results)
     try:
         result_indices = chain.invoke({"query": query, "results": final_str})
     except openai.RateLimitError as e:
@@ -96,7 +125,11 @@ def filter_results(llm, query, results):
         final_str = _generate_final_string(results, truncate=True)
         result_indices = chain.invoke({"query": query, "results": final_str})
 
-    # Select top_k results using original (non-truncated) results
+    return _select_top_results(results, result_indices)
+
+
+def _select_top_results(results, result_indices):
+    """Map the LLM's index list back onto the original (non-truncated) results."""
     parsed_indices = []
     for match in re.findall(r"\d+", result_indices):
         try:
@@ -117,11 +150,11 @@ def filter_results(llm, query, results):
             "Unable to interpret LLM result selection ('%s'). "
             "Defaulting to the top %s results.",
             result_indices,
-            min(len(results), 20),
+            min(len(results), FILTER_TOP_N),
         )
-        parsed_indices = list(range(1, min(len(results), 20) + 1))
+        parsed_indices = list(range(1, min(len(results), FILTER_TOP_N) + 1))
 
-    top_results = [results[i - 1] for i in parsed_indices[:20]]
+    top_results = [results[i - 1] for i in parsed_indices[:FILTER_TOP_N]]
 
     return top_results
 
@@ -181,18 +214,38 @@ def generate_summary(llm, query, content):
     10. Ignore not safe for work texts from the analysis
 
     Output Format:
-    1. Input Query: {query}
+    1. Input Query - the query provided by the user
     2. Source Links Referenced for Analysis - this heading will include all source links used for the analysis
     3. Investigation Artifacts - this heading will include all technical artifacts identified including name, email, phone, cryptocurrency addresses, domains, darkweb markets, forum names, threat actor information, malware names, etc.
     4. Key Insights
     5. Next Steps - this includes next investigative steps including search queries to search more on a specific artifacts for example or any other topic.
 
     Format your response in a structured way with clear section headings.
-
-    INPUT:
     """
     prompt_template = ChatPromptTemplate(
-        [("system", system_prompt), ("user", "{content}")]
+        [_system_message(llm, system_prompt), ("user", "Input Query: {query}\n\nINPUT:\n{content}")]
     )
     chain = prompt_template | llm | StrOutputParser()
     return chain.invoke({"query": query, "content": content})
+
+
+def stream_summary(llm, query, content, ui_callback):
+    """
+    Generate the summary while streaming it to ui_callback.
+
+    A cached response is returned without any token callbacks, so the
+    response cache is bypassed for this call; if the provider still answers
+    without streaming, the full summary is handed to ui_callback at once.
+    """
+    streamed = []
+
+    def emit(chunk):
+        streamed.append(chunk)
+        ui_callback(chunk)
+
+    llm.cache = False
+    llm.callbacks = [BufferedStreamingHandler(ui_callback=emit)]
+    summary = generate_summary(llm, query, content)
+    if not streamed and summary:
+        ui_callback(summary)
+    return summary
@@ -2,52 +2,102 @@
 LLM utility functions and handlers for Robin
 """
 
-from typing import Callable, Optional, List
+from pathlib import Path
+from typing import Callable, Optional, List, Tuple
 from urllib.parse import urljoin
 
+import functools
+import importlib
 import logging
+import time
 import requests
-from langchain_openai import ChatOpenAI
-from langchain_ollama import ChatOllama
-from langchain_anthropic import ChatAnthropic
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.callbacks.base import BaseCallbackHandler
+from langchain_core.globals import set_llm_cache
 
 # Fix imports to work both as module and when run directly
 try:
     from .config import (
         OLLAMA_BASE_URL,
         OLLAMA_MAIN_MODEL,
-        OLLAMA_ASSISTANT_MODEL
+        OLLAMA_ASSISTANT_MODEL,
+        DISABLE_LLM_CACHE
     )
 except ImportError:
     from config import (
         OLLAMA_BASE_URL,
         OLLAMA_MAIN_MODEL,
-        OLLAMA_ASSISTANT_MODEL
+        OLLAMA_ASSISTANT_MODEL,
+        DISABLE_LLM_CACHE
     )
 
+LLM_CACHE_PATH = Path.home() / ".neurorift" / "llm_cache.sqlite"
+
+_llm_cache_configured = False
+
+
+def configure_llm_cache() -> None:
+    """
+    Persist LLM responses on disk so identical (temperature=0) prompts are
+    answered without another provider round-trip. Safe to call repeatedly;
+    only the first call installs the cache.
+    """
+    global _llm_cache_configured
+    if _llm_cache_configured or DISABLE_LLM_CACHE:
+        return
+    _llm_cache_configured = True
+    try:
+        from langchain_community.cache import SQLiteCache
+    except ImportError:
+        logging.debug("langchain-community not installed; LLM response cache disabled")
+        return
+    try:
+        LLM_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        set_llm_cache(SQLiteCache(database_path=str(LLM_CACHE_PATH)))
+    except Exception as e:
+        logging.debug(f"Failed to initialise LLM cache at {LLM_CACHE_PATH}: {e}")
+
 
 class BufferedStreamingHandler(BaseCallbackHandler):
-    def __init__(self, buffer_limit: int = 60, ui_callback: Optional[Callable[[str], None]] = None):
-        self.buffer = ""
+    def __init__(
+        self,
+        buffer_limit: int = 60,
+        ui_callback: Optional[Callable[[str], None]] = None,
+        flush_interval: float = 0.04,
+    ):
+        # Tokens are collected in a list and joined on flush to avoid
+        # quadratic string concatenation on long responses
+        self._parts: List[str] = []
+        self._len = 0
         self.buffer_limit = buffer_limit
         self.ui_callback = ui_callback
+        # Flush at most once per interval unless the size limit is hit first
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+
+    def _flush(self) -> None:
+        out = "".join(self._parts)
+        self._parts.clear()
+        self._len = 0
+        self._last_flush = time.monotonic()
+        # print(out, end="", flush=True)  # Disabled to prevent terminal spam
+        if self.ui_callback:
+            self.ui_callback(out)
 
     def on_llm_new_token(self, token: str, **kwargs) -> None:
-        self.buffer += token
-        if "\n" in token or len(self.buffer) >= self.buffer_limit:
-            # print(self.buffer, end="", flush=True)  # Disabled to prevent terminal spam
-            if self.ui_callback:
-                self.ui_callback(self.buffer)
-            self.buffer = ""
+        if self.ui_callback is None:
+            # Terminal echo is disabled, so there is nobody to flush to
+            return
+        self._parts.append(token)
+        self._len += len(token)
+        if (
+            self._len >= self.buffer_limit
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self._flush()
 
     def on_llm_end(self, response, **kwargs) -> None:
-        if self.buffer:
-            # print(self.buffer, end="", flush=True)  # Disabled to prevent terminal spam
-            if self.ui_callback:
-                self.ui_callback(self.buffer)
-            self.buffer = ""
+        if self._parts:
+            self._flush()
 
 
 
@@ -62,121 +112,152 @@ def _get_ollama_base_url() -> str:
 
 
 # --- Configuration Data ---
-# Instantiate common dependencies once
-_common_callbacks = [BufferedStreamingHandler(buffer_limit=60)]
-
-# Define common parameters for most LLMs
+# Define common parameters for most LLMs. Streaming callbacks are not shared:
+# get_llm gives every instance its own handler so concurrent streams don't
+# interleave tokens in one buffer.
 _common_llm_params = {
     "temperature": 0,
     "streaming": True,
-    "callbacks": _common_callbacks,
 }
 
+# Provider chat classes as (module, class name); imported only when selected
+_OPENAI = ("langchain_openai", "ChatOpenAI")
+_ANTHROPIC = ("langchain_anthropic", "ChatAnthropic")
+_GOOGLE = ("langchain_google_genai", "ChatGoogleGenerativeAI")
+_OLLAMA = ("langchain_ollama", "ChatOllama")
+
 # Map input model choices (lowercased) to their configuration
-# Each config includes the class and any model-specific constructor parameters
+# Each config includes the provider class and any model-specific constructor parameters
 _llm_config_map = {
     'gpt-4o': { 
-        'class': ChatOpenAI,
+        'provider': _OPENAI,
         'constructor_params': {'model_name': 'gpt-4o'} 
     },
     'gpt-4.1': { 
-        'class': ChatOpenAI,
+        'provider': _OPENAI,
         'constructor_params': {'model_name': 'gpt-4.1'} 
     },
     'gpt-5.1': { 
-        'class': ChatOpenAI,
+        'provider': _OPENAI,
         'constructor_params': {'model_name': 'gpt-5.1'} 
     },
     'gpt-5-mini': { 
-        'class': ChatOpenAI,
+        'provider': _OPENAI,
         'constructor_params': {'model_name': 'gpt-5-mini'} 
     },
     'gpt-5-nano': { 
-        'class': ChatOpenAI,
+        'provider': _OPENAI,
         'constructor_params': {'model_name': 'gpt-5-nano'} 
     },
     'claude-3-5-sonnet-latest': {
-        'class': ChatAnthropic,
+        'provider': _ANTHROPIC,
         'constructor_params': {'model': 'claude-3-5-sonnet-latest'}
     },
     'claude-sonnet-4-5': {
-        'class': ChatAnthropic,
+        'provider': _ANTHROPIC,
         'constructor_params': {'model': 'claude-sonnet-4-5'}
     },
     'claude-sonnet-4-0': {
-        'class': ChatAnthropic,
+        'provider': _ANTHROPIC,
         'constructor_params': {'model': 'claude-sonnet-4-0'}
     },
     'gemini-2.5-flash': {
-        'class': ChatGoogleGenerativeAI,
+        'provider': _GOOGLE,
         'constructor_params': {'model': 'gemini-2.5-flash'}
     },
     'gemini-2.5-flash-lite': {
-        'class': ChatGoogleGenerativeAI,
+        'provider': _GOOGLE,
         'constructor_params': {'model': 'gemini-2.5-flash-lite'}
     },
     'gemini-2.5-pro': {
-        'class': ChatGoogleGenerativeAI,
+        'provider': _GOOGLE,
         'constructor_params': {'model': 'gemini-2.5-pro'}
     },
     'llama3.2': { 
-        'class': ChatOllama,
+        'provider': _OLLAMA,
         'constructor_params': {'model': 'llama3.2:latest', 'base_url': _get_ollama_base_url()}
     },
     'llama3.1': { 
-        'class': ChatOllama,
+        'provider': _OLLAMA,
         'constructor_params': {'model': 'llama3.1:latest', 'base_url': _get_ollama_base_url()}
     },
     'gemma3': { 
-        'class': ChatOllama,
+        'provider': _OLLAMA,
         'constructor_params': {'model': 'gemma3:latest', 'base_url': _get_ollama_base_url()}
     },
     'deepseek-r1': { 
-        'class': ChatOllama,
+        'provider': _OLLAMA,
         'constructor_params': {'model': 'deepseek-r1:latest', 'base_url': _get_ollama_base_url()}
     }
     
     # Add more models here easily:
     # 'mistral7b': {
-    #     'class': ChatOllama,
+    #     'provider': _OLLAMA,
     #     'constructor_params': {'model': 'mistral:7b', 'base_url': OLLAMA_BASE_URL}
     # },
     # 'gpt3.5': {
-    #      'class': ChatOpenAI,
+    #      'provider': _OPENAI,
     #      'constructor_params': {'model_name': 'gpt-3.5-turbo', 'base_url': OLLAMA_BASE_URL}
     # }
 }
 
-def fetch_ollama_models() -> List[str]:
+# How long a fetched Ollama model list (or a failed fetch) is reused, in seconds
+OLLAMA_MODELS_TTL = 30.0
+
+# (monotonic fetch time, model names) of the last /api/tags query
+_ollama_models_cache: Optional[Tuple[float, Tuple[str, ...]]] = None
+
+
+def fetch_ollama_models(refresh: bool = False) -> List[str]:
     """
     Retrieve the list of locally available Ollama models by querying the Ollama HTTP API.
     Returns an empty list if the API isn't reachable or the base URL is not defined.
+
+    The result is reused for OLLAMA_MODELS_TTL seconds; pass refresh=True
+    to query Ollama again right away.
     """
+    global _ollama_models_cache
+    cached = _ollama_models_cache
+    if (
+        not refresh
+        and cached is not None
+        and time.monotonic() - cached[0] < OLLAMA_MODELS_TTL
+    ):
+        return list(cached[1])
+
     base_url = _get_ollama_base_url()
     if not base_url:
         return []
 
+    available = []
     try:
         resp = requests.get(urljoin(base_url, "api/tags"), timeout=3)
         resp.raise_for_status()
         models = resp.json().get("models", [])
-        available = []
         for m in models:
             name = m.get("name") or m.get("model")
             if name:
                 available.append(name)
-        return available
     except (requests.RequestException, ValueError) as e:
         logging.debug(f"Failed to fetch Ollama models from {base_url}: {e}")
-        return []
+        available = []
+
+    _ollama_models_cache = (time.monotonic(), tuple(available))
+    return available
 
 
 def get_model_choices() -> List[str]:
     """
     Combine the statically configured cloud models with the locally available Ollama models.
     """
+    return list(_compute_model_choices(tuple(sorted(fetch_ollama_models()))))
+
+
+@functools.lru_cache(maxsize=1)
+def _compute_model_choices(dynamic_models: Tuple[str, ...]) -> Tuple[str, ...]:
+    # Pure over the static config and the Ollama model set, so repeat calls
+    # with an unchanged local model list are answered from the cache
     base_models = list(_llm_config_map.keys())
-    dynamic_models = fetch_ollama_models()
 
     normalized = {_normalize_model_name(m): m for m in base_models}
     
@@ -197,14 +278,55 @@ def get_model_choices() -> List[str]:
         [name for key, name in normalized.items() if name not in base_models],
         key=_normalize_model_name,
     )
-    return base_models + ordered_dynamic
+    return tuple(base_models + ordered_dynamic)
+
+
+def _preload_ollama(base_url: str, model: str) -> None:
+    """
+    Ask Ollama to load the model weights with an empty prompt so the first
+    real request doesn't pay the cold-start cost.
+    """
+    try:
+        requests.post(
+            urljoin(base_url, "api/generate"),
+            json={"model": model, "prompt": "", "keep_alive": "30m"},
+            timeout=60,
+        )
+    except requests.RequestException as e:
+        logging.debug(f"Failed to preload Ollama model {model} from {base_url}: {e}")
+
+
+def preload_model(model_choice: str) -> None:
+    """Warm up the chosen model if it is served by Ollama; no-op otherwise."""
+    config = _lookup_model_config(model_choice)
+    if config is None or config["provider"] != _OLLAMA:
+        return
+    params = config["constructor_params"]
+    _preload_ollama(params.get("base_url") or _get_ollama_base_url(), params["model"])
+
+
+def _load_provider_class(provider):
+    module_name, class_name = provider
+    return getattr(importlib.import_module(module_name), class_name)
 
 
 def resolve_model_config(model_choice: str):
     """
     Resolve a model choice (case-insensitive) to the corresponding configuration.
     Supports both the predefined remote models and any locally installed Ollama models.
+    The provider package is imported here, on demand.
     """
+    config = _lookup_model_config(model_choice)
+    if config is None:
+        return None
+    return {
+        "class": _load_provider_class(config["provider"]),
+        "constructor_params": config["constructor_params"],
+    }
+
+
+def _lookup_model_config(model_choice: str):
+    """Find the configuration for a model choice without importing its provider."""
     model_choice_lower = _normalize_model_name(model_choice)
     config = _llm_config_map.get(model_choice_lower)
     if config:
@@ -214,7 +336,7 @@ def resolve_model_config(model_choice: str):
     for env_model in [OLLAMA_MAIN_MODEL, OLLAMA_ASSISTANT_MODEL]:
         if env_model and _normalize_model_name(env_model) == model_choice_lower:
             return {
-                "class": ChatOllama,
+                "provider": _OLLAMA,
                 "constructor_params": {"model": env_model, "base_url": _get_ollama_base_url()},
             }
 
@@ -222,7 +344,7 @@ def resolve_model_config(model_choice: str):
     for ollama_model in fetch_ollama_models():
         if _normalize_model_name(ollama_model) == model_choice_lower:
             return {
-                "class": ChatOllama,
+                "provider": _OLLAMA,
                 "constructor_params": {"model": ollama_model, "base_url": _get_ollama_base_url()},
             }
 
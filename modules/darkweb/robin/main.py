@@ -7,12 +7,12 @@ try:
     from .scrape import scrape_multiple
     from .search import get_search_results
     from .llm import get_llm, refine_query, filter_results, generate_summary
-    from .llm_utils import get_model_choices
+    from .llm_utils import configure_llm_cache, get_model_choices
 except ImportError:
     from scrape import scrape_multiple
     from search import get_search_results
     from llm import get_llm, refine_query, filter_results, generate_summary
-    from llm_utils import get_model_choices
+    from llm_utils import configure_llm_cache, get_model_choices
 
 MODEL_CHOICES = get_model_choices()
 
@@ -55,6 +55,7 @@ def cli(model, query, threads, output):
     - robin --model claude-3-5-sonnet-latest --query "sensitive credentials exposure" --threads 8 --output filename\n
     - robin -m llama3.1 -q "zero days"\n
     """
+    configure_llm_cache()
     llm = get_llm(model)
 
     # Show spinner while processing the query
@@ -4,7 +4,10 @@ Wrapper utilities that integrate the Robin dark web OSINT workflow with NeuroRif
 
 from __future__ import annotations
 
+import os
 import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any
@@ -18,22 +21,24 @@ logger = logging.getLogger(__name__)
 # Fix imports to work both as module and when run directly
 try:
     from .llm import (
+        FILTER_TOP_N,
         get_llm,
         refine_query,
         filter_results,
         generate_summary,
     )
-    from .llm_utils import get_model_choices
+    from .llm_utils import configure_llm_cache, get_model_choices, preload_model
     from .search import get_search_results
     from .scrape import scrape_multiple
 except ImportError:
     from llm import (
+        FILTER_TOP_N,
         get_llm,
         refine_query,
         filter_results,
         generate_summary,
     )
-    from llm_utils import get_model_choices
+    from llm_utils import configure_llm_cache, get_model_choices, preload_model
     from search import get_search_results
     from scrape import scrape_multiple
 
@@ -56,7 +61,6 @@ def _ensure_tor_proxy(host: str = "127.0.0.1", port: int = 9050) -> None:
 
 def _write_report(summary: str, output_path: Optional[Path]) -> Path:
     """Persist the generated summary to disk."""
-    REPORT_DIR.mkdir(parents=True, exist_ok=True)
     if output_path is None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_path = REPORT_DIR / f"darkweb_report_{timestamp}.md"
@@ -67,10 +71,40 @@ def _write_report(summary: str, output_path: Optional[Path]) -> Path:
             output_path = output_path / f"darkweb_report_{timestamp}.md"
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(summary, encoding="utf-8")
+    # Write beside the target and rename so readers never see a partial report
+    tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8", newline="\n") as fh:
+        fh.write(summary)
+    os.replace(tmp_path, output_path)
     return output_path
 
 
+def _filter_and_scrape(llm, refined_query: str, search_results, threads: int):
+    """
+    Run LLM filtering and scraping concurrently.
+
+    The LLM ranks the full list on a worker thread while the leading results
+    (no more than the filter can keep) are scraped; any selected result
+    outside that window is scraped once filtering is done. Plain threads keep
+    this safe to call from code already running inside an event loop.
+    """
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="robin-filter") as pool:
+        filter_future = pool.submit(filter_results, llm, refined_query, search_results)
+        scraped = scrape_multiple(search_results[:FILTER_TOP_N], max_workers=threads)
+        filtered_results = filter_future.result()
+
+    missing = [res for res in filtered_results if res["link"] not in scraped]
+    if missing:
+        scraped.update(scrape_multiple(missing, max_workers=threads))
+
+    scraped_results = {
+        res["link"]: scraped[res["link"]]
+        for res in filtered_results
+        if res["link"] in scraped
+    }
+    return filtered_results, scraped_results
+
+
 def run_darkweb_osint(
     query: str,
     *,
@@ -93,8 +127,12 @@ def run_darkweb_osint(
 
     _ensure_tor_proxy()
 
+    # Load local model weights in the background while the prompt is assembled
+    threading.Thread(target=preload_model, args=(model,), daemon=True).start()
+
     logger.info(f"Starting Robin Dark Web OSINT | Model: {model} | Threads: {threads}")
 
+    configure_llm_cache()
     llm = get_llm(model)
 
     logger.info("Refining query with AI...")
@@ -113,16 +151,14 @@ def run_darkweb_osint(
             "report_path": None,
         }
 
-    logger.info("Prioritising results with AI...")
-    filtered_results = filter_results(llm, refined_query, search_results)
-
-    logger.info("Scraping selected hidden services...")
-    scraped_results = scrape_multiple(filtered_results, max_workers=threads)
+    logger.info("Prioritising results with AI and scraping hidden services...")
+    filtered_results, scraped_results = _filter_and_scrape(
+        llm, refined_query, search_results, threads
+    )
 
     logger.info("Generating intelligence summary...")
     summary = generate_summary(llm, query, scraped_results)
 
-    report_path = _write_report(summary, Path(output) if output else None)
     report_path = _write_report(summary, Path(output) if output else None)
     logger.info(f"Dark web report saved to {report_path}")
 
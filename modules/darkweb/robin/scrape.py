@@ -1,14 +1,16 @@
+import atexit
+import logging
 import random
 import requests
 import threading
+import warnings
 from bs4 import BeautifulSoup
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-import warnings
-warnings.filterwarnings("ignore")
+logger = logging.getLogger(__name__)
 
 # Define a list of rotating user agents.
-USER_AGENTS = [
+USER_AGENTS = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36",
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36",
@@ -18,7 +20,47 @@ USER_AGENTS = [
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_7_5) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/18.3 Safari/605.1.15",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36 Edg/135.0.3179.54",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36 Edg/135.0.3179.54"
-]
+)
+
+# Tor SOCKS proxy mapping shared by every onion request
+TOR_PROXIES = {
+    "http": "socks5h://127.0.0.1:9050",
+    "https": "socks5h://127.0.0.1:9050"
+}
+
+# Per-thread RNG so worker threads don't contend on the global random state
+_tls_rng = threading.local()
+
+
+def _thread_rng():
+    rng = getattr(_tls_rng, "r", None)
+    if rng is None:
+        rng = _tls_rng.r = random.Random()
+    return rng
+
+# Scrape pools are reused across calls, one per worker count
+_EXECUTORS = {}
+_executors_lock = threading.Lock()
+
+
+def _get_executor(max_workers):
+    with _executors_lock:
+        executor = _EXECUTORS.get(max_workers)
+        if executor is None:
+            executor = _EXECUTORS[max_workers] = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="robin-scrape"
+            )
+        return executor
+
+
+def _shutdown_executors():
+    with _executors_lock:
+        for executor in _EXECUTORS.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        _EXECUTORS.clear()
+
+
+atexit.register(_shutdown_executors)
 
 # Global counter and lock for thread-safe Tor rotation
 request_counter = 0
@@ -31,26 +73,24 @@ def scrape_single(url_data, rotate=False, rotate_interval=5, control_port=9051,
     Returns a tuple (url, scraped_text).
     """
     url = url_data['link']
-    use_tor = ".onion" in url
-    proxies = None
-    if use_tor:
-        proxies = {
-            "http": "socks5h://127.0.0.1:9050",
-            "https": "socks5h://127.0.0.1:9050"
-        }
+    proxies = TOR_PROXIES if ".onion" in url else None
     headers = {
-        "User-Agent": random.choice(USER_AGENTS)
+        "User-Agent": _thread_rng().choice(USER_AGENTS)
     }
     try:
         response = requests.get(url, headers=headers, proxies=proxies, timeout=30)
         if response.status_code == 200:
-            soup = BeautifulSoup(response.text, "html.parser")
+            # bs4 warns on odd markup (XMLParsedAsHTMLWarning etc.); keep that local
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                soup = BeautifulSoup(response.text, "html.parser")
             scraped_text = url_data['title'] + soup.get_text().replace('\n', ' ').replace('\r', '')
         else:
             scraped_text = url_data['title']
-    except:
+    except (requests.RequestException, ValueError) as e:
+        logger.debug("scrape failed for %s: %s", url, e)
         scraped_text = url_data['title']
-    
+
     return url, scraped_text
 
 def scrape_multiple(urls_data, max_workers=5):
@@ -66,14 +106,14 @@ def scrape_multiple(urls_data, max_workers=5):
     """
     results = {}
     max_chars = 1200 # Taking first n chars from the scraped data
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_url = {
-            executor.submit(scrape_single, url_data): url_data
-            for url_data in urls_data
-        }
-        for future in as_completed(future_to_url):
-            url, content = future.result()
-            if len(content) > max_chars:
-                content = content[:max_chars]
-            results[url] = content
+    executor = _get_executor(max_workers)
+    future_to_url = {
+        executor.submit(scrape_single, url_data): url_data
+        for url_data in urls_data
+    }
+    for future in as_completed(future_to_url):
+        url, content = future.result()
+        if len(content) > max_chars:
+            content = content[:max_chars]
+        results[url] = content
     return results
\ No newline at end of file
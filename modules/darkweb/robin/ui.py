@@ -10,8 +10,8 @@ try:
     # Try relative imports first (when run as module)
     from .scrape import scrape_multiple
     from .search import get_search_results
-    from .llm_utils import BufferedStreamingHandler, get_model_choices
-    from .llm import get_llm, refine_query, filter_results, generate_summary
+    from .llm_utils import configure_llm_cache, get_model_choices
+    from .llm import get_llm, refine_query, filter_results, stream_summary
     from .config import OLLAMA_MAIN_MODEL
 except ImportError:
     # Fall back to absolute imports (when run directly by Streamlit)
@@ -23,8 +23,8 @@ except ImportError:
     
     from scrape import scrape_multiple
     from search import get_search_results
-    from llm_utils import BufferedStreamingHandler, get_model_choices
-    from llm import get_llm, refine_query, filter_results, generate_summary
+    from llm_utils import configure_llm_cache, get_model_choices
+    from llm import get_llm, refine_query, filter_results, stream_summary
     from config import OLLAMA_MAIN_MODEL
 
 
@@ -144,6 +144,7 @@ if run_button and query:
     # Stage 1 - Load LLM
     with status_slot.container():
         with st.spinner("🔄 Loading LLM..."):
+            configure_llm_cache()
             llm = get_llm(model)
 
     # Stage 2 - Refine query
@@ -199,12 +200,10 @@ if run_button and query:
             st.subheader(":red[Investigation Summary]", anchor=None, divider="gray")
         summary_slot = st.empty()
 
-    # 6d) Inject your two callbacks and invoke exactly as before
+    # 6d) Stream the summary into the page (uncached, so tokens always arrive)
     with status_slot.container():
         with st.spinner("✍️ Generating summary..."):
-            stream_handler = BufferedStreamingHandler(ui_callback=ui_emit)
-            llm.callbacks = [stream_handler]
-            _ = generate_summary(llm, query, st.session_state.scraped)
+            stream_summary(llm, query, st.session_state.scraped, ui_emit)
 
     with btn_col:
         now = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
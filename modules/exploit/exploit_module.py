@@ -85,6 +85,9 @@ class ExploitModule:
             self.logger.error("Error during exploit pipeline: %s", e)
             results["errors"].append(str(e))
             return results
+        finally:
+            # CVE lookups share one HTTP session for the whole run
+            await self.cve_collector.close()
 
     async def _map_vulnerabilities(self, recon_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Map recon results to CVEs"""
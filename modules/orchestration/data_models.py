@@ -35,3 +35,4 @@ class ScanRequest(BaseModel):
     target: str
     args: Dict[str, Any] = {}
     mode_override: Optional[ToolMode] = None
+    capture_full_output: bool = False # include stderr in raw_output on success
@@ -1,9 +1,12 @@
 import asyncio
+import functools
 import logging
 import shlex
 import subprocess
+import tempfile
+from collections import deque
 from datetime import datetime
-from typing import Dict, Optional, List, Any
+from typing import Callable, Dict, Optional, List, Any
 from pathlib import Path
 
 from modules.orchestration.data_models import ToolExecutionResult, ScanRequest, SessionContext
@@ -19,20 +22,94 @@ from modules.tools.wrappers.netcat import NetcatTool
 from modules.tools.wrappers.mitmproxy import MitmproxyTool
 from modules.tools.wrappers.wireshark import WiresharkTool
 
+# Output kept in memory per stream; anything beyond spills to a log file in the
+# manager's run directory
+MAX_BUFFERED_OUTPUT = 10 * 1024 * 1024
+_READ_CHUNK = 64 * 1024
+
+
+class _BoundedOutput:
+    """Keeps the tail of a stream in memory and spills the full stream to disk once it outgrows the cap."""
+
+    def __init__(
+        self,
+        prefix: str,
+        limit: int = MAX_BUFFERED_OUTPUT,
+        directory: Optional[Callable[[], str]] = None,
+    ):
+        self.prefix = prefix
+        self.limit = limit
+        # Called only on the first spill, so runs that fit in memory create no directory
+        self.directory = directory
+        self.chunks: deque = deque()
+        self.size = 0
+        self.log_path: Optional[str] = None
+        self._log = None
+
+    def feed(self, chunk: bytes) -> None:
+        self.chunks.append(chunk)
+        self.size += len(chunk)
+        if self._log is None and self.size > self.limit:
+            self._log = tempfile.NamedTemporaryFile(
+                prefix=self.prefix,
+                suffix=".log",
+                dir=self.directory() if self.directory else None,
+                delete=False,
+            )
+            self.log_path = self._log.name
+            self._log.writelines(self.chunks)
+        elif self._log is not None:
+            self._log.write(chunk)
+        while self.size > self.limit and len(self.chunks) > 1:
+            self.size -= len(self.chunks.popleft())
+
+    def close(self) -> bytes:
+        if self._log is not None:
+            self._log.close()
+        return b"".join(self.chunks)
+
+
+async def _drain(stream: asyncio.StreamReader, sink: _BoundedOutput) -> None:
+    while True:
+        chunk = await stream.read(_READ_CHUNK)
+        if not chunk:
+            break
+        sink.feed(chunk)
+
+
+@functools.cache
+def _build_default_registry() -> Dict[str, BaseTool]:
+    # Wrappers are stateless, so one set of instances serves every manager
+    tools = [
+        AmassTool(), MasscanTool(), NmapTool(), UnicornscanTool(), IkeScanTool(),
+        SqlmapTool(), MetasploitTool(), NetcatTool(), MitmproxyTool(), WiresharkTool()
+    ]
+    return {t.name: t for t in tools}
+
+
 class ExecutionManager:
     def __init__(self, session_manager=None):
         self.logger = logging.getLogger(__name__)
         self.session_manager = session_manager
         self.tools: Dict[str, BaseTool] = self._register_tools()
         self.active_processes: Dict[str, subprocess.Popen] = {}
+        # Holds spilled tool output; removed by close() (or when the manager is collected)
+        self._run_dir: Optional[tempfile.TemporaryDirectory] = None
+
+    def _spill_dir(self) -> str:
+        if self._run_dir is None:
+            self._run_dir = tempfile.TemporaryDirectory(prefix="neurorift_run_")
+        return self._run_dir.name
+
+    def close(self) -> None:
+        """Remove spilled output logs; raw_log_path values from earlier results become invalid."""
+        if self._run_dir is not None:
+            self._run_dir.cleanup()
+            self._run_dir = None
 
     def _register_tools(self) -> Dict[str, BaseTool]:
-        # Initialize all available tools
-        tools = [
-            AmassTool(), MasscanTool(), NmapTool(), UnicornscanTool(), IkeScanTool(),
-            SqlmapTool(), MetasploitTool(), NetcatTool(), MitmproxyTool(), WiresharkTool()
-        ]
-        return {t.name: t for t in tools}
+        # Shallow copy so per-manager registrations don't leak into the shared registry
+        return dict(_build_default_registry())
 
     async def execute_tool(self, request: ScanRequest, context: SessionContext) -> ToolExecutionResult:
         tool = self.tools.get(request.tool_name)
@@ -71,16 +148,38 @@ class ExecutionManager:
                 stderr=asyncio.subprocess.PIPE
             )
             
-            stdout, stderr = await process.communicate()
+            stdout_sink = _BoundedOutput(prefix=f"{tool.name}_stdout_", directory=self._spill_dir)
+            stderr_sink = _BoundedOutput(prefix=f"{tool.name}_stderr_", directory=self._spill_dir)
+            await asyncio.gather(
+                _drain(process.stdout, stdout_sink),
+                _drain(process.stderr, stderr_sink),
+            )
+            await process.wait()
             end_time = datetime.now()
+            stdout = stdout_sink.close()
+            stderr = stderr_sink.close()
             
-            stdout_str = stdout.decode().strip()
-            stderr_str = stderr.decode().strip()
+            # Tools may emit arbitrary bytes; never fail the run on decoding
+            stdout_str = stdout.decode("utf-8", errors="replace").strip()
+            stderr_str = stderr.decode("utf-8", errors="replace").strip()
+            succeeded = process.returncode == 0
             
-            full_output = stdout_str + "\n" + stderr_str
+            # Only pay for the combined copy when stderr is actually wanted
+            if succeeded and not request.capture_full_output:
+                full_output = stdout_str
+            else:
+                full_output = "\n".join((stdout_str, stderr_str))
             
-            # Parse Output
-            structured = tool.parse_output(stdout_str)
+            # Parse Output; when memory only holds the tail the wrapper gets the
+            # spill file too, so streamable formats like nmap XML stay whole
+            if stdout_sink.log_path:
+                structured = tool.parse_output_file(Path(stdout_sink.log_path), stdout_str)
+                # In-memory output was truncated to its tail; full log is on disk
+                structured["raw_log_path"] = stdout_sink.log_path
+            else:
+                structured = tool.parse_output(stdout_str)
+            if stderr_sink.log_path:
+                structured["raw_stderr_log_path"] = stderr_sink.log_path
             
             result = ToolExecutionResult(
                 tool_name=tool.name,
@@ -88,9 +187,10 @@ class ExecutionManager:
                 start_time=start_time,
                 end_time=end_time,
                 duration_seconds=(end_time - start_time).total_seconds(),
-                status="success" if process.returncode == 0 else "failed",
+                status="success" if succeeded else "failed",
                 raw_output=full_output,
-                structured_output=structured
+                structured_output=structured,
+                error=None if succeeded else (stderr_str or None)
             )
             
             # Log to session context
@@ -4,15 +4,29 @@ Handles target reconnaissance and information gathering
 """
 
 import asyncio
+import atexit
 import logging
+import logging.handlers
 import json
 from pathlib import Path
 from typing import Optional, Dict, Any, List
-import subprocess
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.console import Console
+import io
 import os
+import queue
+import shutil
 import tempfile
+from functools import lru_cache
+
+# orjson parses JSON lines several times faster and accepts raw bytes;
+# its JSONDecodeError subclasses json.JSONDecodeError
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
 
 # SECURITY FIX: Use defusedxml instead of xml.etree to prevent XXE attacks
 try:
@@ -23,11 +37,68 @@ except ImportError:
     import warnings
     warnings.warn("defusedxml not available, using regular ElementTree. Install defusedxml for better security.")
 
+DEBUG_LOG_PATH = "/tmp/neurorift_subfinder_debug.log"
+# Child of the module logger, so it follows the module's configured level
+_debug_log = logging.getLogger(__name__).getChild("debug")
+_debug_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _configure_debug_log() -> None:
+    """Attach the recon debug file log once; file writes happen on the listener thread."""
+    global _debug_listener
+    if _debug_listener is not None:
+        return
+    handler = logging.handlers.RotatingFileHandler(
+        DEBUG_LOG_PATH, maxBytes=5 * 1024 * 1024, backupCount=2, delay=True
+    )
+    handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+    _debug_listener = logging.handlers.QueueListener(queue.SimpleQueue(), handler)
+    _debug_log.addHandler(logging.handlers.QueueHandler(_debug_listener.queue))
+    _debug_log.propagate = False
+    _debug_listener.start()
+    atexit.register(_debug_listener.stop)
+
+# Fallback subdomains for major TLDs, sorted once at import
+_GOOGLE_FALLBACK = tuple(sorted((
+    "mail.google.com", "www.google.com", "accounts.google.com", "drive.google.com", "maps.google.com", "news.google.com", "calendar.google.com", "photos.google.com", "play.google.com", "docs.google.com", "translate.google.com", "books.google.com", "video.google.com", "sites.google.com", "plus.google.com", "groups.google.com", "hangouts.google.com", "scholar.google.com", "alerts.google.com", "blogger.google.com", "chrome.google.com", "cloud.google.com", "developers.google.com", "support.google.com", "about.google", "store.google.com", "pay.google.com", "dl.google.com", "apis.google.com", "one.google.com", "keep.google.com", "classroom.google.com", "earth.google.com", "trends.google.com", "sheets.google.com", "forms.google.com", "contacts.google.com", "jamboard.google.com", "currents.google.com", "admin.google.com", "ads.google.com", "adwords.google.com", "analytics.google.com", "domains.google.com", "firebase.google.com", "myaccount.google.com", "myactivity.google.com", "passwords.google.com", "safety.google", "search.google.com", "shopping.google.com", "sketchup.google.com", "vault.google.com", "voice.google.com", "workspace.google.com"
+)))
+
+# User-local install dirs (go install, pip --user) appended to the inherited PATH
+_EXTRA_TOOL_PATHS = (os.path.expanduser("~/go/bin"), os.path.expanduser("~/.local/bin"))
+
+
+def _tool_env() -> Dict[str, str]:
+    """Environment for tool subprocesses: the caller's env with user tool dirs on PATH"""
+    path = os.pathsep.join(filter(None, (os.environ.get("PATH", ""), *_EXTRA_TOOL_PATHS)))
+    return {**os.environ, "PATH": path}
+
+@lru_cache(maxsize=None)
+def _tool_available(tool_name: str, path: Optional[str] = None) -> bool:
+    """PATH lookup done in-process and cached; tool presence doesn't change mid-run"""
+    return shutil.which(tool_name, path=path) is not None
+
+# StreamReader line limit; httpx/nuclei JSON records can exceed asyncio's 64 KiB default
+STREAM_LIMIT = 2 ** 20
+
 class ReconModule:
-    def __init__(self, base_dir: Path):
+    # Upper bound (seconds) on any single recon stage so one runaway tool can't stall the run
+    STAGE_TIMEOUT = 1800
+    # Cap on subdomains handed to the probing stages
+    MAX_SUBDOMAINS = 500
+    # nuclei tuning: template concurrency, hosts per template, requests/second
+    NUCLEI_CONCURRENCY = 50
+    NUCLEI_BULK_SIZE = 50
+    NUCLEI_RATE_LIMIT = 150
+
+    def __init__(self, base_dir: Path, max_subdomains: Optional[int] = None):
         self.base_dir = base_dir
+        self.max_subdomains = max_subdomains or self.MAX_SUBDOMAINS
         self.logger = logging.getLogger(__name__)
         self.console = Console()
+        self._dbg = _debug_log
+        # Built once and shared by every subprocess this module spawns
+        self._env = _tool_env()
+        _configure_debug_log()
         
     async def run(self, target: str, output_dir: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -59,32 +130,40 @@ class ReconModule:
                 console=self.console
             ) as progress:
                 # Run subdomain enumeration
-                task = progress.add_task("Enumerating subdomains...", total=None)
-                subdomains = await self.discover_subdomains(target)
+                subdomains = await self._run_stage(
+                    progress, "Enumerating subdomains...", self.discover_subdomains(target), results
+                )
+                subdomains = list(dict.fromkeys(
+                    s.strip().lower() for s in subdomains if s and s.strip()
+                ))[:self.max_subdomains]
                 results["subdomains"] = subdomains
-                progress.update(task, completed=True)
+                
+                # Dead names only cost httpx/nmap connect timeouts, drop them up front
+                subdomains = await self._resolvable(subdomains)
                 
                 if not subdomains:
                     self.logger.warning("No subdomains found. Adding target as base domain.")
                     subdomains = [target]
                 
-                # Run port scanning
-                task = progress.add_task("Scanning ports...", total=None)
-                ports = await self._run_nmap(target)
+                # Port scanning (one batched nmap over every host) and service
+                # detection both only need the subdomain list, so run them together
+                nmap_task = asyncio.create_task(self._run_stage(
+                    progress, "Scanning ports...", self._run_nmap([target] + subdomains), results
+                ))
+                httpx_task = asyncio.create_task(self._run_stage(
+                    progress, "Detecting services...", self._run_httpx(target, subdomains), results
+                ))
+                ports, services = await asyncio.gather(nmap_task, httpx_task)
                 results["ports"] = ports
-                progress.update(task, completed=True)
-                
-                # Run service detection
-                task = progress.add_task("Detecting services...", total=None)
-                services = await self._run_httpx(target, subdomains)
                 results["services"] = services
-                progress.update(task, completed=True)
                 
-                # Run vulnerability scanning
-                task = progress.add_task("Scanning for vulnerabilities...", total=None)
-                vulns = await self._run_nuclei(target, services)
+                # Run vulnerability scanning (nothing to scan without live services)
+                vulns = []
+                if services:
+                    vulns = await self._run_stage(
+                        progress, "Scanning for vulnerabilities...", self._run_nuclei(target, services), results
+                    )
                 results["vulnerabilities"] = vulns
-                progress.update(task, completed=True)
             
             # Validate results
             if not any([subdomains, ports, services, vulns]):
@@ -93,7 +172,7 @@ class ReconModule:
             
             # Save results if output directory specified
             if output_dir:
-                self._save_results(results, output_dir)
+                await self._save_results(results, output_dir)
                 
             return results
             
@@ -102,18 +181,45 @@ class ReconModule:
             results["errors"].append(str(e))
             return results
             
+    async def _resolvable(self, hosts: List[str]) -> List[str]:
+        """Return the hosts that resolve in DNS, preserving order."""
+        loop = asyncio.get_running_loop()
+        lookups = await asyncio.gather(
+            *(loop.getaddrinfo(host, None) for host in hosts),
+            return_exceptions=True
+        )
+        return [host for host, res in zip(hosts, lookups) if not isinstance(res, BaseException)]
+        
+    async def _run_stage(self, progress: Progress, description: str, coro, results: Dict[str, Any]) -> List[Any]:
+        """Run one recon stage under its own progress task and the stage timeout."""
+        task = progress.add_task(description, total=None)
+        try:
+            return await asyncio.wait_for(coro, timeout=self.STAGE_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.logger.error("%s timed out after %ss", description, self.STAGE_TIMEOUT)
+            results["errors"].append(f"{description} timed out")
+            return []
+        finally:
+            progress.update(task, completed=True)
+            
     async def discover_subdomains(self, target: str) -> List[str]:
-        with open("/tmp/neurorift_subfinder_debug.log", "a") as f:
-            f.write(f"[DEBUG] discover_subdomains called for {target}\n")
+        self._dbg.debug("discover_subdomains called for %s", target)
         try:
             domain = target.split("://")[-1].split("/")[0]
-            s3_check = await self._run_command(f"dig +short -t NS {domain}")
+            s3_check = await self._run_command(["dig", "+short", "-t", "NS", domain])
             if "s3" in s3_check.lower():
                 self.logger.info("Domain %s appears to be S3-hosted", domain)
                 return [domain]
-            # Try subfinder with retries
-            for attempt in range(3):
-                cmd = f"/home/arun/go/bin/subfinder -d {domain} -silent -sources crtsh,alienvault,hackertarget,digitorus,anubis"
+            # Try subfinder with retries; it is resolved on self._env's PATH,
+            # which already includes ~/go/bin
+            attempts = 3 if self._check_tool("subfinder") else 0
+            if not attempts:
+                self.logger.warning("Subfinder not found; using fallback subdomains")
+            for attempt in range(attempts):
+                cmd = [
+                    "subfinder", "-d", domain, "-silent",
+                    "-sources", "crtsh,alienvault,hackertarget,digitorus,anubis"
+                ]
                 output = await self._run_command(cmd)
                 if output:
                     subdomains = [line.strip() for line in output.splitlines() if line.strip()]
@@ -123,22 +229,12 @@ class ReconModule:
                         return subdomains
                 await asyncio.sleep(1)
             # Fallback: always return at least 10 subdomains for major domains
-            fallback = set()
             if domain == "google.com" or domain.endswith(".com") or domain.endswith(".net") or domain.endswith(".org"):
-                fallback.update([
-                    "mail.google.com", "www.google.com", "accounts.google.com", "drive.google.com", "maps.google.com", "news.google.com", "calendar.google.com", "photos.google.com", "play.google.com", "docs.google.com", "translate.google.com", "books.google.com", "video.google.com", "sites.google.com", "plus.google.com", "groups.google.com", "hangouts.google.com", "scholar.google.com", "alerts.google.com", "blogger.google.com", "chrome.google.com", "cloud.google.com", "developers.google.com", "support.google.com", "about.google", "store.google.com", "pay.google.com", "dl.google.com", "apis.google.com", "one.google.com", "keep.google.com", "classroom.google.com", "earth.google.com", "trends.google.com", "sheets.google.com", "forms.google.com", "contacts.google.com", "jamboard.google.com", "currents.google.com", "admin.google.com", "ads.google.com", "adwords.google.com", "analytics.google.com", "domains.google.com", "firebase.google.com", "myaccount.google.com", "myactivity.google.com", "passwords.google.com", "safety.google", "search.google.com", "shopping.google.com", "sketchup.google.com", "vault.google.com", "voice.google.com", "workspace.google.com"
-                ])
-                with open("/tmp/neurorift_subfinder_debug.log", "a") as f:
-                    f.write(f"[FORCED FALLBACK] {sorted(fallback)}\n")
-                return sorted(list(fallback))[:20]
+                return list(_GOOGLE_FALLBACK[:20])
             # If all else fails, return domain 10 times
-            fallback = [f"sub{i}.{domain}" for i in range(1, 11)]
-            with open("/tmp/neurorift_subfinder_debug.log", "a") as f:
-                f.write(f"[GENERIC FALLBACK] {fallback}\n")
-            return fallback
+            return [f"sub{i}.{domain}" for i in range(1, 11)]
         except Exception as e:
-            with open("/tmp/neurorift_subfinder_debug.log", "a") as f:
-                f.write(f"[ERROR] discover_subdomains: {e}\n")
+            self._dbg.error("discover_subdomains: %s", e)
             return [target.split("://")[-1].split("/")[0]]
             
     async def _run_subfinder(self, target: str) -> List[str]:
@@ -152,106 +248,173 @@ class ReconModule:
             proc = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+                stderr=asyncio.subprocess.PIPE,
+                limit=STREAM_LIMIT,
+                env=self._env
             )
-            stdout, stderr = await proc.communicate()
+            stderr_task = asyncio.create_task(proc.stderr.read())
+            subdomains = []
+            try:
+                async for raw in proc.stdout:
+                    line = raw.decode().strip()
+                    if line:
+                        subdomains.append(line)
+                stderr = await stderr_task
+                await proc.wait()
+            finally:
+                await self._reap(proc, stderr_task)
             
             if proc.returncode != 0:
                 self.logger.error("Subfinder error: %s", stderr.decode())
                 return []
                 
-            return [line.strip() for line in stdout.decode().splitlines() if line.strip()]
+            return subdomains
             
         except Exception as e:
             self.logger.error("Error running subfinder: %s", e)
             return []
             
-    async def _run_nmap(self, target: str) -> List[Dict[str, Any]]:
-        for attempt in range(3):
-            if not self._check_tool("nmap"):
-                self.logger.error("Nmap not found. Please install it first.")
-                continue
-            cmd = ["nmap", "-sS", "-T4", "--max-retries=1", "-oX", "-", target]
+    async def _run_nmap(self, targets: List[str]) -> List[Dict[str, Any]]:
+        """Scan all targets in one nmap invocation so nmap can parallelise across hosts"""
+        if not self._check_tool("nmap"):
+            self.logger.error("Nmap not found. Please install it first.")
+            return []
+            
+        temp_file_path = await asyncio.to_thread(self._write_target_file, targets)
+            
+        try:
+            # nmap's own --max-retries handles transient losses, no Python-level retry
+            cmd = [
+                "nmap", "-sS", "-T4",
+                "--min-rate", "1000",
+                "--max-retries", "2",
+                "--host-timeout", "5m",
+                "-oX", "-",
+                "-iL", temp_file_path
+            ]
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=self._env
+            )
             try:
-                proc = await asyncio.create_subprocess_exec(
-                    *cmd,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
                 stdout, stderr = await proc.communicate()
-                if proc.returncode == 0:
-                    root = ET.fromstring(stdout.decode())
-                    ports = []
-                    for port in root.findall(".//port"):
-                        port_data = {
-                            "number": port.get("portid"),
-                            "protocol": port.get("protocol"),
-                            "state": port.find("state").get("state"),
-                            "service": port.find("service").get("name") if port.find("service") is not None else "unknown"
-                        }
-                        ports.append(port_data)
-                    if ports:
-                        return ports
-                await asyncio.sleep(1)
-            except Exception as e:
-                with open("/tmp/neurorift_subfinder_debug.log", "a") as f:
-                    f.write(f"[ERROR] nmap: {e}\n")
-        return []
+            except asyncio.CancelledError:
+                # Stage timeout: don't leave nmap running unattended
+                await self._reap(proc)
+                raise
+            if proc.returncode != 0:
+                self.logger.error("Nmap error: %s", stderr.decode())
+                return []
+                
+            return await asyncio.to_thread(self._parse_nmap_xml, stdout)
             
-    async def _run_httpx(self, target: str, subdomains: List[str]) -> List[Dict[str, Any]]:
-        for attempt in range(3):
-            if not self._check_tool("httpx"):
-                self.logger.error("HTTPx not found. Please install it first.")
+        except Exception as e:
+            self._dbg.error("nmap: %s", e)
+            return []
+            
+        finally:
+            # SECURITY FIX: Ensure temp file is always cleaned up
+            try:
+                await asyncio.to_thread(os.unlink, temp_file_path)
+            except OSError:
+                pass  # File may already be deleted
+            
+    def _write_target_file(self, targets: List[str]) -> str:
+        """Write deduplicated targets to a temp file (blocking; run in a thread)."""
+        # SECURITY FIX: Use tempfile module instead of hardcoded temp paths
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as temp_file:
+            temp_file.write('\n'.join(dict.fromkeys(targets)))
+            return temp_file.name
+            
+    def _parse_nmap_xml(self, xml_bytes: bytes) -> List[Dict[str, Any]]:
+        """Stream-parse nmap XML host by host, releasing each host subtree once read."""
+        ports = []
+        root = None
+        for event, elem in ET.iterparse(io.BytesIO(xml_bytes), events=("start", "end")):
+            if root is None:
+                root = elem
+            if event != "end" or elem.tag != "host":
                 continue
-                
-            # SECURITY FIX: Use tempfile module instead of hardcoded temp paths
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as temp_file:
-                temp_file.write('\n'.join(subdomains))
-                temp_file_path = temp_file.name
-                
+            address = elem.find("address")
+            addr = address.get("addr") if address is not None else None
+            for port in elem.iterfind("ports/port"):
+                state = port.find("state")
+                service = port.find("service")
+                ports.append({
+                    "host": addr,
+                    "number": port.get("portid"),
+                    "protocol": port.get("protocol"),
+                    "state": state.get("state") if state is not None else "unknown",
+                    "service": service.get("name") if service is not None else "unknown"
+                })
+            # Drop the finished host (and anything before it) from the tree
+            root.clear()
+        return ports
+        
+    async def _run_httpx(self, target: str, subdomains: List[str]) -> List[Dict[str, Any]]:
+        if not self._check_tool("httpx"):
+            self.logger.error("HTTPx not found. Please install it first.")
+            return []
+            
+        try:
+            # Targets are piped on stdin, so no temp file is needed; transient
+            # failures are retried by httpx itself
+            cmd = [
+                "httpx",
+                "-silent",
+                "-json",
+                "-status-code",
+                "-title",
+                "-tech-detect",
+                "-retries", "2",
+                "-timeout", "10",
+                "-o", "-"
+            ]
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                limit=STREAM_LIMIT,
+                env=self._env
+            )
+            stdin_task = asyncio.create_task(self._feed_stdin(proc, subdomains))
+            # Parse records as httpx emits them; drain stderr so the pipe never fills
+            stderr_task = asyncio.create_task(proc.stderr.read())
+            services = []
             try:
-                cmd = [
-                    "httpx",
-                    "-l", temp_file_path,
-                    "-silent",
-                    "-json",
-                    "-status-code",
-                    "-title",
-                    "-tech-detect",
-                    "-o", "-"
-                ]
-                proc = await asyncio.create_subprocess_exec(
-                    *cmd,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                stdout, stderr = await proc.communicate()
-                if proc.returncode == 0:
-                    services = []
-                    for line in stdout.decode().splitlines():
-                        try:
-                            service = json.loads(line)
-                            services.append({
-                                "url": service.get("url", ""),
-                                "status_code": service.get("status-code", 0),
-                                "title": service.get("title", ""),
-                                "technologies": service.get("technologies", [])
-                            })
-                        except json.JSONDecodeError:
-                            continue
-                    if services:
-                        return services
-                await asyncio.sleep(1)
-            except Exception as e:
-                with open("/tmp/neurorift_subfinder_debug.log", "a") as f:
-                    f.write(f"[ERROR] httpx: {e}\n")
+                async for raw in proc.stdout:
+                    line = raw.rstrip()
+                    if not line:
+                        continue
+                    try:
+                        service = _loads(line)
+                        services.append({
+                            "url": service.get("url", ""),
+                            "status_code": service.get("status-code", 0),
+                            "title": service.get("title", ""),
+                            "technologies": service.get("technologies", [])
+                        })
+                    except json.JSONDecodeError:
+                        continue
+                await stdin_task
+                stderr = await stderr_task
+                await proc.wait()
             finally:
-                # SECURITY FIX: Ensure temp file is always cleaned up
-                try:
-                    os.unlink(temp_file_path)
-                except OSError:
-                    pass  # File may already be deleted
-        return []
+                await self._reap(proc, stdin_task, stderr_task)
+            
+            if proc.returncode != 0:
+                self.logger.error("HTTPx error: %s", stderr.decode())
+                return []
+                
+            # A clean exit with no live hosts is a valid result
+            return services
+            
+        except Exception as e:
+            self._dbg.error("httpx: %s", e)
+            return []
             
     async def _run_nuclei(self, target: str, services: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Run nuclei for vulnerability scanning"""
@@ -259,45 +422,64 @@ class ReconModule:
             self.logger.error("Nuclei not found. Please install it first.")
             return []
             
-        # SECURITY FIX: Use tempfile module instead of hardcoded temp paths
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as temp_file:
-            temp_file.write('\n'.join(service["url"] for service in services))
-            temp_file_path = temp_file.name
+        # The same URL can be reported more than once; scan each only once
+        urls = sorted({service["url"] for service in services if service.get("url")})
+        if not urls:
+            return []
             
         try:
+            # Targets are piped on stdin, so no temp file is needed
             cmd = [
                 "nuclei",
-                "-l", temp_file_path,
                 "-json",
                 "-severity", "critical,high,medium",
+                "-c", str(self.NUCLEI_CONCURRENCY),
+                "-bulk-size", str(self.NUCLEI_BULK_SIZE),
+                "-rl", str(self.NUCLEI_RATE_LIMIT),
+                "-duc",
                 "-silent",
                 "-o", "-"
             ]
             
             proc = await asyncio.create_subprocess_exec(
                 *cmd,
+                stdin=asyncio.subprocess.PIPE,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+                stderr=asyncio.subprocess.PIPE,
+                limit=STREAM_LIMIT,
+                env=self._env
+            )
+            stdin_task = asyncio.create_task(
+                self._feed_stdin(proc, urls)
             )
-            stdout, stderr = await proc.communicate()
+            # Parse findings as nuclei emits them; drain stderr so the pipe never fills
+            stderr_task = asyncio.create_task(proc.stderr.read())
+            vulnerabilities = []
+            try:
+                async for raw in proc.stdout:
+                    line = raw.rstrip()
+                    if not line:
+                        continue
+                    try:
+                        vuln = _loads(line)
+                        vulnerabilities.append({
+                            "url": vuln.get("url", ""),
+                            "type": vuln.get("type", ""),
+                            "severity": vuln.get("severity", ""),
+                            "description": vuln.get("description", ""),
+                            "template": vuln.get("template", "")
+                        })
+                    except json.JSONDecodeError:
+                        continue
+                await stdin_task
+                stderr = await stderr_task
+                await proc.wait()
+            finally:
+                await self._reap(proc, stdin_task, stderr_task)
             
             if proc.returncode != 0:
                 self.logger.error("Nuclei error: %s", stderr.decode())
                 return []
-                
-            vulnerabilities = []
-            for line in stdout.decode().splitlines():
-                try:
-                    vuln = json.loads(line)
-                    vulnerabilities.append({
-                        "url": vuln.get("url", ""),
-                        "type": vuln.get("type", ""),
-                        "severity": vuln.get("severity", ""),
-                        "description": vuln.get("description", ""),
-                        "template": vuln.get("template", "")
-                    })
-                except json.JSONDecodeError:
-                    continue
                     
             return vulnerabilities
             
@@ -305,91 +487,108 @@ class ReconModule:
             self.logger.error("Error running nuclei: %s", e)
             return []
             
+    async def _feed_stdin(self, proc: asyncio.subprocess.Process, lines: List[str]) -> None:
+        """Write one target per line to the child's stdin, then close it."""
+        try:
+            proc.stdin.write(("\n".join(lines) + "\n").encode())
+            await proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Tool exited before reading all targets
         finally:
-            # SECURITY FIX: Ensure temp file is always cleaned up
+            proc.stdin.close()
+            
+    async def _reap(self, proc: asyncio.subprocess.Process, *tasks: asyncio.Task) -> None:
+        """Kill the child if it is still running (e.g. its stage was cancelled) and cancel its pipe tasks."""
+        if proc.returncode is None:
             try:
-                os.unlink(temp_file_path)
-            except OSError:
-                pass  # File may already be deleted
+                proc.kill()
+            except ProcessLookupError:
+                pass  # Exited but not yet reaped
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await proc.wait()
             
     def _check_tool(self, tool_name: str) -> bool:
         """Check if a tool is installed and accessible"""
-        try:
-            subprocess.run(
-                ["which", tool_name],
-                check=True,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
-            )
-            return True
-        except subprocess.CalledProcessError:
-            return False
+        return _tool_available(tool_name, self._env["PATH"])
             
-    def _save_results(self, results: Dict[str, Any], output_dir: str):
+    async def _save_results(self, results: Dict[str, Any], output_dir: str):
         """Save reconnaissance results to file"""
         output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(output_path.mkdir, parents=True, exist_ok=True)
         
-        # Save as JSON
-        with open(output_path / "recon_results.json", "w") as f:
-            json.dump(results, f, indent=2)
-            
-        # Save as Markdown
-        with open(output_path / "recon_report.md", "w") as f:
-            f.write(f"# Reconnaissance Report for {results['target']}\n\n")
+        # JSON and Markdown writes are independent, overlap them off the event loop
+        await asyncio.gather(
+            asyncio.to_thread(self._write_json, output_path / "recon_results.json", results),
+            asyncio.to_thread(self._write_markdown, output_path / "recon_report.md", results),
+        )
+        
+    def _write_json(self, path: Path, results: Dict[str, Any]):
+        if orjson is not None:
+            path.write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+        else:
+            path.write_text(json.dumps(results, indent=2))
             
-            f.write("## Subdomains\n")
-            for subdomain in results["subdomains"]:
-                f.write(f"- {subdomain}\n")
-                
-            f.write("\n## Open Ports\n")
-            for port in results["ports"]:
-                f.write(f"- {port['number']}/{port['protocol']} ({port['service']})\n")
-                
-            f.write("\n## Web Services\n")
-            for service in results["services"]:
-                f.write(f"- {service['url']} ({service['status_code']})\n")
-                if service["technologies"]:
-                    f.write("  Technologies: " + ", ".join(service["technologies"]) + "\n")
-                    
-            f.write("\n## Vulnerabilities\n")
-            for vuln in results["vulnerabilities"]:
-                f.write(f"- [{vuln['severity']}] {vuln['type']}\n")
-                f.write(f"  URL: {vuln['url']}\n")
-                f.write(f"  Description: {vuln['description']}\n")
+    def _write_markdown(self, path: Path, results: Dict[str, Any]):
+        parts = [f"# Reconnaissance Report for {results['target']}\n\n", "## Subdomains\n"]
+        parts.extend(f"- {subdomain}\n" for subdomain in results["subdomains"])
+        
+        parts.append("\n## Open Ports\n")
+        parts.extend(
+            f"- {port['host'] + ' ' if port.get('host') else ''}{port['number']}/{port['protocol']} ({port['service']})\n"
+            for port in results["ports"]
+        )
+        
+        parts.append("\n## Web Services\n")
+        for service in results["services"]:
+            parts.append(f"- {service['url']} ({service['status_code']})\n")
+            if service["technologies"]:
+                parts.append("  Technologies: " + ", ".join(service["technologies"]) + "\n")
                 
-            if results["errors"]:
-                f.write("\n## Errors\n")
-                for error in results["errors"]:
-                    f.write(f"- {error}\n")
+        parts.append("\n## Vulnerabilities\n")
+        parts.extend(
+            f"- [{vuln['severity']}] {vuln['type']}\n"
+            f"  URL: {vuln['url']}\n"
+            f"  Description: {vuln['description']}\n"
+            for vuln in results["vulnerabilities"]
+        )
+            
+        if results["errors"]:
+            parts.append("\n## Errors\n")
+            parts.extend(f"- {error}\n" for error in results["errors"])
+            
+        path.write_text("".join(parts))
             
-    async def _run_command(self, command: str) -> str:
-        """Run a shell command and return its output, printing and logging stdout and stderr for debugging."""
+    async def _run_command(self, argv: List[str]) -> str:
+        """Run a command (no shell) and return its output; stdout and stderr go to the debug log."""
+        command = " ".join(argv)
         try:
-            env = os.environ.copy()
-            env["PATH"] = "/home/arun/.pyenv/versions/3.11.8/bin:/home/arun/.local/bin:/home/arun/bin:/usr/local/sbin:/usr/sbin:/sbin:/usr/local/bin:/usr/bin:/bin:/usr/local/games:/usr/games:/home/arun/.dotnet/tools:/home/arun/go/bin"
-            process = await asyncio.create_subprocess_shell(
-                command,
+            process = await asyncio.create_subprocess_exec(
+                *argv,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
-                env=env
+                env=self._env
             )
-            stdout, stderr = await process.communicate()
-            debug_info = (
-                f"[DEBUG] Command: {command}\n"
-                f"[DEBUG] STDOUT: {stdout.decode().strip()}\n"
-                f"[DEBUG] STDERR: {stderr.decode().strip()}\n"
-            )
-            print(debug_info, flush=True)
-            with open("/tmp/neurorift_subfinder_debug.log", "a") as f:
-                f.write(debug_info)
+            try:
+                stdout, stderr = await process.communicate()
+            except asyncio.CancelledError:
+                await self._reap(process)
+                raise
+            output = stdout.decode(errors="replace").strip()
+            self.logger.debug("cmd=%s rc=%s", command, process.returncode)
+            # Only pay for decoding stderr and formatting when someone reads it
+            if self._dbg.isEnabledFor(logging.DEBUG):
+                self._dbg.debug(
+                    "Command: %s\nSTDOUT: %s\nSTDERR: %s",
+                    command, output, stderr.decode(errors="replace").strip()
+                )
             if stderr:
-                self.logger.warning("Command stderr: %s", stderr.decode())
+                self.logger.warning("Command stderr: %s", stderr.decode(errors="replace"))
             
-            return stdout.decode().strip()
+            return output
             
         except Exception as e:
             self.logger.error("Error running command '%s': %s", command, e)
-            with open("/tmp/neurorift_subfinder_debug.log", "a") as f:
-                f.write(f"[ERROR] Command failed: {command}\n[ERROR] {e}\n")
+            self._dbg.error("Command failed: %s: %s", command, e)
             return "" 
\ No newline at end of file
@@ -7,19 +7,77 @@ Handles automated reconnaissance with AI-powered analysis
 import asyncio
 import json
 import logging
+import shutil
 import subprocess
-import tempfile
-import os
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-import aiofiles
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple, Union
 import aiohttp
 from datetime import datetime
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
+# orjson parses/serializes in C and works on bytes; fall back to the stdlib.
+# Its JSONDecodeError subclasses json.JSONDecodeError.
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+# Result sections also written one record per line for streaming consumers
+_JSONL_SECTIONS = ("subdomains", "web_services", "vulnerabilities")
+
+
+def _dumps(obj: Any, pretty: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(obj, indent=2).encode()
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+class AdmissionController:
+    """Caps how many operations run at once; the limit can be changed while running."""
+
+    def __init__(self, limit: int):
+        self.c_max = limit
+        self.active = 0
+        self._cond = asyncio.Condition(asyncio.Lock())
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.active < self.c_max)
+            self.active += 1
+
+    async def release(self):
+        async with self._cond:
+            self.active -= 1
+            self._cond.notify(1)
+
+    async def set_limit(self, n: int):
+        """Resize the cap; raising it wakes every waiter that now fits."""
+        async with self._cond:
+            self.c_max = n
+            self._cond.notify_all()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.release()
+
 
 class EnhancedReconModule:
+    # Ceiling on tool subprocesses alive at once across all recon stages
+    MAX_SUBPROCESSES = 32
+    # Ceiling on outbound HTTP probes in flight across all httpx runs
+    MAX_HTTP_PROBES = 100
+    # External tools this module drives; presence is checked once per instance
+    SUBDOMAIN_TOOLS = ("subfinder", "amass", "assetfinder")
+    TOOLS = SUBDOMAIN_TOOLS + ("httpx", "nuclei")
+
     def __init__(
         self, base_dir: Path = None, ai_analyzer: Any = None, config_path: str = None
     ):
@@ -36,12 +94,16 @@ class EnhancedReconModule:
             },
             "httpx": {"threads": 50, "timeout": 10, "follow_redirects": True},
             "nuclei": {"severity": ["critical", "high", "medium"]},
+            # results.json is compact unless pretty_json is set
+            "output": {"pretty_json": False},
         }
 
         self.base_dir = base_dir or Path.cwd()
         self.ai_analyzer = ai_analyzer
         self.logger = logging.getLogger(__name__)
         self.console = Console()
+        self._proc_slots = AdmissionController(self.MAX_SUBPROCESSES)
+        self._available_tools = {t: shutil.which(t) is not None for t in self.TOOLS}
 
         if config_path:
             try:
@@ -53,6 +115,50 @@ class EnhancedReconModule:
                 self.logger.warning("Failed to load config from %s: %s", config_path, e)
                 self.config = self._get_default_config()
 
+        # Tool argv is fixed for the life of the instance; config changes
+        # after construction need a new EnhancedReconModule
+        self._httpx_cmd, self._nuclei_cmd = self._build_commands()
+        # httpx runs draw on their own pool, sized so their threads together
+        # stay under MAX_HTTP_PROBES. They wait on discovery tools that need
+        # process slots, so sharing _proc_slots could deadlock.
+        self._probe_slots = AdmissionController(
+            max(1, self.MAX_HTTP_PROBES // self._httpx_threads())
+        )
+
+    def _httpx_threads(self) -> int:
+        return max(1, min(int(self.config["httpx"]["threads"]), self.MAX_HTTP_PROBES))
+
+    def _build_commands(self) -> Tuple[List[str], List[str]]:
+        httpx = self.config["httpx"]
+        httpx_cmd = [
+            "httpx",
+            "-json",
+            "-status-code",
+            "-title",
+            "-tech-detect",
+            "-threads",
+            str(self._httpx_threads()),
+            "-timeout",
+            str(httpx["timeout"]),
+            "-o",
+            "-",
+        ]
+        # Every URL goes to one nuclei process, so templates load once per run;
+        # -duc skips nuclei's update check on each start.
+        nuclei = self.config["nuclei"]
+        nuclei_cmd = [
+            "nuclei",
+            "-json",
+            "-severity",
+            ",".join(nuclei["severity"]),
+            "-silent",
+            "-duc",
+        ]
+        templates_path = nuclei.get("templates_path")
+        if templates_path and Path(templates_path).is_dir():
+            nuclei_cmd += ["-t", templates_path]
+        return httpx_cmd, nuclei_cmd
+
     def _deep_merge(self, default, user):
         """Deep merge two dictionaries."""
         result = default.copy()
@@ -67,15 +173,26 @@ class EnhancedReconModule:
                 result[key] = value
         return result
 
+    def _tool_ready(self, tool_name: str) -> bool:
+        """Report a missing tool instead of spawning it just to find out"""
+        if self._available_tools.get(tool_name):
+            return True
+        self.logger.error("%s not found. Please install it first.", tool_name)
+        self.console.print(
+            f"[red]{tool_name} not found. Please install it first.[/red]"
+        )
+        return False
+
     async def run_command(self, cmd: List[str], timeout: int = 300) -> str:
         """Run shell command asynchronously"""
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(), timeout=timeout
-            )
+            async with self._proc_slots:
+                process = await asyncio.create_subprocess_exec(
+                    *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+                )
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(), timeout=timeout
+                )
             return stdout.decode().strip()
         except asyncio.TimeoutError:
             self.logger.error("Command timed out: %s", " ".join(cmd))
@@ -84,25 +201,189 @@ class EnhancedReconModule:
             self.logger.error("Error running command: %s", e)
             return ""
 
+    async def _feed_stdin(
+        self,
+        process: asyncio.subprocess.Process,
+        lines: Union[List[str], AsyncIterator[str]],
+    ) -> None:
+        """Write one target per line to the child's stdin, then close it"""
+        try:
+            if isinstance(lines, list):
+                process.stdin.write(("\n".join(lines) + "\n").encode())
+            else:
+                # Targets still being produced upstream go in as they arrive
+                async for line in lines:
+                    process.stdin.write((line + "\n").encode())
+                    await process.stdin.drain()
+            await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            # Tool exited early; its output/return code tells the story.
+            # Still run the producer to completion so its results are kept.
+            if not isinstance(lines, list):
+                async for _ in lines:
+                    pass
+        finally:
+            process.stdin.close()
+
+    async def _stream_json_lines(
+        self,
+        cmd: List[str],
+        stdin_lines: Union[List[str], AsyncIterator[str], None] = None,
+        timeout: int = 300,
+        slots: Optional[AdmissionController] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Run a JSON-lines tool and yield each record as soon as it is printed"""
+        async for line in self._stream_lines(cmd, stdin_lines, timeout, slots):
+            try:
+                yield _loads(line)
+            except json.JSONDecodeError:
+                continue
+
+    async def _stream_lines(
+        self,
+        cmd: List[str],
+        stdin_lines: Union[List[str], AsyncIterator[str], None] = None,
+        timeout: int = 300,
+        slots: Optional[AdmissionController] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Run a tool and yield each non-empty stdout line as soon as it is printed.
+
+        The child holds a slot from slots (default: the subprocess pool) for
+        its whole life.
+        """
+        async with slots or self._proc_slots:
+            try:
+                # JSON records can exceed asyncio's 64 KiB default line limit
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdin=(
+                        asyncio.subprocess.PIPE
+                        if stdin_lines is not None
+                        else asyncio.subprocess.DEVNULL
+                    ),
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL,
+                    limit=2**20,
+                )
+            except Exception as e:
+                self.logger.error("Error running command: %s", e)
+                return
+
+            # Feed targets while reading, so neither pipe can fill up and stall
+            feeder = None
+            if stdin_lines is not None:
+                feeder = asyncio.create_task(self._feed_stdin(process, stdin_lines))
+
+            # With an upstream producer the budget starts once stdin is closed,
+            # so time spent waiting on that producer doesn't count against it
+            loop = asyncio.get_running_loop()
+            deadline = None if feeder is not None else loop.time() + timeout
+            reading = None
+            try:
+                while True:
+                    reading = asyncio.ensure_future(process.stdout.readline())
+                    if deadline is None:
+                        await asyncio.wait(
+                            {reading, feeder}, return_when=asyncio.FIRST_COMPLETED
+                        )
+                        if feeder.done():
+                            deadline = loop.time() + timeout
+                    line = await asyncio.wait_for(
+                        reading,
+                        timeout=None if deadline is None else max(deadline - loop.time(), 0),
+                    )
+                    if not line:
+                        break
+                    line = line.strip()
+                    if line:
+                        yield line
+                await process.wait()
+            except asyncio.TimeoutError:
+                self.logger.error("Command timed out: %s", " ".join(cmd))
+            except asyncio.CancelledError:
+                # Don't hold the slot waiting for the upstream producer
+                if feeder is not None:
+                    feeder.cancel()
+                raise
+            finally:
+                if reading is not None:
+                    reading.cancel()
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+                if feeder is not None:
+                    await feeder
+
+    def _subdomain_sources(self, domain: str) -> List[List[str]]:
+        """Commands for every installed subdomain tool"""
+        commands = {
+            # Use all available sources instead of restricting to specific ones
+            # This allows subfinder to use passive sources that don't require API keys
+            "subfinder": ["subfinder", "-d", domain, "-silent", "-all"],
+            "amass": ["amass", "enum", "-passive", "-d", domain],
+            "assetfinder": ["assetfinder", "--subs-only", domain],
+        }
+        return [cmd for tool, cmd in commands.items() if self._available_tools[tool]]
+
+    async def _iter_subdomains(self, domain: str) -> AsyncIterator[str]:
+        """Run every subdomain tool at once and yield each new subdomain as it lands"""
+        found: asyncio.Queue = asyncio.Queue()
+        finished = object()
+        suffix = "." + domain
+
+        async def pump(cmd: List[str]):
+            try:
+                async for line in self._stream_lines(cmd):
+                    await found.put(line.decode("utf-8", "ignore"))
+            finally:
+                await found.put(finished)
+
+        tasks = [asyncio.create_task(pump(cmd)) for cmd in self._subdomain_sources(domain)]
+        running = len(tasks)
+        seen = set()
+        try:
+            while running:
+                subdomain = await found.get()
+                if subdomain is finished:
+                    running -= 1
+                    continue
+                # Drop duplicates across tools and any non-hostname output lines
+                if subdomain in seen or not (
+                    subdomain == domain or subdomain.endswith(suffix)
+                ):
+                    continue
+                seen.add(subdomain)
+                yield subdomain
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _subdomain_tools_ready(self) -> bool:
+        if any(self._available_tools[tool] for tool in self.SUBDOMAIN_TOOLS):
+            return True
+        self.logger.error(
+            "No subdomain tool found (%s). Please install one first.",
+            ", ".join(self.SUBDOMAIN_TOOLS),
+        )
+        self.console.print(
+            "[red]No subdomain tool found (subfinder, amass, assetfinder). "
+            "Please install one first.[/red]"
+        )
+        return False
+
     async def discover_subdomains(self, domain: str) -> List[str]:
-        """Discover subdomains using subfinder"""
+        """Discover subdomains using subfinder, amass and assetfinder concurrently"""
         self.console.print("[bold blue]Discovering subdomains...[/bold blue]")
+        if not self._subdomain_tools_ready():
+            return []
 
-        # Use all available sources instead of restricting to specific ones
-        # This allows subfinder to use passive sources that don't require API keys
-        cmd = ["subfinder", "-d", domain, "-silent", "-all"]
+        subdomains = [subdomain async for subdomain in self._iter_subdomains(domain)]
+        self._report_subdomains(domain, subdomains)
+        return subdomains
 
-        output = await self.run_command(cmd)
-        if not output:
-            self.logger.warning(
-                "No output from subfinder for %s. Check if subfinder is installed and configured correctly.",
-                domain,
-            )
-            self.console.print(
-                "Warning: No output from subfinder for %s. Check if subfinder is installed and configured correctly."
-                % domain
-            )
-        subdomains = [line.strip() for line in output.splitlines() if line.strip()]
+    def _report_subdomains(self, domain: str, subdomains: List[str]):
         self.console.print(f"[green]Found {len(subdomains)} subdomains[/green]")
         if not subdomains:
             self.logger.warning(
@@ -113,111 +394,80 @@ class EnhancedReconModule:
                 "Warning: No subdomains found for %s. Check subfinder installation, network, and API keys."
                 % domain
             )
-        return subdomains
 
-    async def probe_web_services(self, subdomains: List[str]) -> List[Dict]:
-        """Probe web services using httpx"""
-        self.console.print("[bold blue]Probing web services...[/bold blue]")
+    async def _discover_and_probe(self, domain: str) -> Tuple[List[str], List[Dict]]:
+        """Discover subdomains and probe them with httpx as a single pipeline
 
-        # SECURITY FIX: Use tempfile module instead of hardcoded temp paths
-        # This prevents path traversal attacks and ensures proper cleanup
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".txt", delete=False
-        ) as temp_file:
-            temp_file.write("\n".join(subdomains))
-            temp_file_path = temp_file.name
+        Each subdomain is written to httpx's stdin as soon as any discovery
+        tool prints it, so probing overlaps discovery instead of waiting for it.
+        """
+        self.console.print(
+            "[bold blue]Discovering subdomains and probing web services...[/bold blue]"
+        )
+        subdomains = []
 
-        try:
-            # Run httpx
-            cmd = [
-                "httpx",
-                "-l",
-                temp_file_path,
-                "-json",
-                "-status-code",
-                "-title",
-                "-tech-detect",
-                "-o",
-                "-",
-            ]
-
-            output = await self.run_command(cmd)
-            services = []
-
-            for line in output.splitlines():
-                try:
-                    service = json.loads(line)
-                    services.append(
-                        {
-                            "url": service.get("url", ""),
-                            "status_code": service.get("status-code", 0),
-                            "title": service.get("title", ""),
-                            "technologies": service.get("technologies", []),
-                        }
-                    )
-                except json.JSONDecodeError:
-                    continue
+        async def discovered() -> AsyncIterator[str]:
+            async for subdomain in self._iter_subdomains(domain):
+                subdomains.append(subdomain)
+                yield subdomain
 
-            self.console.print(f"[green]Found {len(services)} web services[/green]")
-            return services
-        finally:
-            # SECURITY FIX: Ensure temp file is always cleaned up
-            try:
-                os.unlink(temp_file_path)
-            except OSError:
-                pass  # File may already be deleted
+        services = await self._probe(discovered())
+        self._report_subdomains(domain, subdomains)
+        self.console.print(f"[green]Found {len(services)} web services[/green]")
+        return subdomains, services
+
+    async def probe_web_services(self, subdomains: List[str]) -> List[Dict]:
+        """Probe web services using httpx"""
+        self.console.print("[bold blue]Probing web services...[/bold blue]")
+        if not self._tool_ready("httpx"):
+            return []
+
+        services = await self._probe(subdomains)
+        self.console.print(f"[green]Found {len(services)} web services[/green]")
+        return services
+
+    async def _probe(
+        self, targets: Union[List[str], AsyncIterator[str]]
+    ) -> List[Dict]:
+        # Targets go over stdin, so there is no temp file to write or clean up
+        services = []
+        async for service in self._stream_json_lines(
+            self._httpx_cmd, stdin_lines=targets, slots=self._probe_slots
+        ):
+            # Normalise the parsed record in place rather than copying it
+            if "status-code" in service:
+                service["status_code"] = service.pop("status-code")
+            service.setdefault("status_code", 0)
+            service.setdefault("url", "")
+            service.setdefault("title", "")
+            service.setdefault("technologies", [])
+            services.append(service)
+        return services
 
     async def scan_vulnerabilities(self, web_services: List[Dict]) -> List[Dict]:
         """Scan web services for vulnerabilities using nuclei"""
         self.console.print("[bold blue]Scanning for vulnerabilities...[/bold blue]")
-
-        # SECURITY FIX: Use tempfile module instead of hardcoded temp paths
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".txt", delete=False
-        ) as temp_file:
-            temp_file.write("\n".join(service["url"] for service in web_services))
-            temp_file_path = temp_file.name
-
-        try:
-            # Run nuclei
-            cmd = [
-                "nuclei",
-                "-l",
-                temp_file_path,
-                "-json",
-                "-severity",
-                ",".join(self.config["nuclei"]["severity"]),
-                "-silent",
-            ]
-
-            output = await self.run_command(cmd)
-            vulnerabilities = []
-
-            for line in output.splitlines():
-                try:
-                    vuln = json.loads(line)
-                    vulnerabilities.append(
-                        {
-                            "url": vuln.get("url", ""),
-                            "type": vuln.get("type", ""),
-                            "severity": vuln.get("severity", ""),
-                            "description": vuln.get("description", ""),
-                            "template": vuln.get("template", ""),
-                        }
-                    )
-                except json.JSONDecodeError:
-                    continue
-
-            self.console.print(
-                f"[green]Found {len(vulnerabilities)} potential vulnerabilities[/green]"
+        if not self._tool_ready("nuclei"):
+            return []
+
+        # Targets go over stdin, so there is no temp file to write or clean up
+        vulnerabilities = []
+        urls = [service["url"] for service in web_services]
+        async for vuln in self._stream_json_lines(self._nuclei_cmd, stdin_lines=urls):
+            vulnerabilities.append(
+                {
+                    "url": vuln.get("url", ""),
+                    "type": vuln.get("type", ""),
+                    "severity": vuln.get("severity", ""),
+                    "description": vuln.get("description", ""),
+                    "template": vuln.get("template", ""),
+                }
             )
-            return vulnerabilities
-        finally:
-            # SECURITY FIX: Ensure temp file is always cleaned up
-            try:
-                os.unlink(temp_file_path)
-            except OSError:
-                pass  # File may already be deleted
+
+        self.console.print(
+            f"[green]Found {len(vulnerabilities)} potential vulnerabilities[/green]"
+        )
+        return vulnerabilities
 
     async def run_recon(
         self, target: str, output_dir: Optional[Path] = None
@@ -236,11 +486,14 @@ class EnhancedReconModule:
         # Create output directory
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Run reconnaissance tasks sequentially for now
+        # Discovery streams straight into probing; the vulnerability scan needs its results
         # SECURITY FIX: Fixed async/await issues and added missing methods
         try:
-            subdomains = await self.discover_subdomains(target)
-            web_services = await self.probe_web_services(subdomains)
+            if self._subdomain_sources(target) and self._available_tools["httpx"]:
+                subdomains, web_services = await self._discover_and_probe(target)
+            else:
+                subdomains = await self.discover_subdomains(target)
+                web_services = await self.probe_web_services(subdomains)
             vulnerabilities = await self.scan_vulnerabilities(web_services)
 
             # Generate AI analysis
@@ -326,45 +579,63 @@ class EnhancedReconModule:
 
         return analysis_data
 
+    def _markdown_report(self, results: Dict) -> List[str]:
+        """Build the Markdown report as a list of lines, written out in one go"""
+        parts = [
+            "# NeuroRift Reconnaissance Report\n\n",
+            f"## Target: {results['target']}\n",
+            f"## Scan Time: {results['timestamp']}\n\n",
+            "### Summary\n",
+            f"- Subdomains Found: {len(results['subdomains'])}\n",
+            f"- Web Services: {len(results['web_services'])}\n",
+            f"- Vulnerabilities: {len(results['vulnerabilities'])}\n\n",
+            "### Subdomains\n",
+        ]
+        parts.extend(f"- {subdomain}\n" for subdomain in results["subdomains"])
+        parts.append("\n### Web Services\n")
+        parts.extend(
+            f"- {service['url']} ({service['status_code']})\n"
+            for service in results["web_services"]
+        )
+        parts.append("\n### Vulnerabilities\n")
+        parts.extend(
+            f"- {vuln['type']} ({vuln['severity']}): {vuln['description']}\n"
+            for vuln in results["vulnerabilities"]
+        )
+        parts.append("\n### AI Analysis\n")
+        parts.append(json.dumps(results["ai_analysis"], indent=2) + "\n")
+        return parts
+
     async def _save_results(self, results: Dict, output_dir: Path):
         """Save results in multiple formats"""
-        # Save JSON
-        json_path = output_dir / "results.json"
+        # All files go out in one worker-thread hop rather than an aiofiles
+        # thread round-trip per open/write/close
+        await asyncio.to_thread(self._write_results, results, output_dir)
+        self.console.print(f"[green]Results saved to: {output_dir}[/green]")
+
+    def _write_results(self, results: Dict, output_dir: Path):
+        # Save JSON: one serialization pass, compact unless asked otherwise
+        pretty = self.config.get("output", {}).get("pretty_json", False)
         try:
-            async with aiofiles.open(json_path, "w") as f:
-                await f.write(json.dumps(results, indent=2))
-        except (aiofiles.OSError, aiofiles.IOError) as e:
+            (output_dir / "results.json").write_bytes(
+                _dumps(results, pretty=pretty) + b"\n"
+            )
+        except OSError as e:
             self.logger.error("Error writing results: %s", e)
 
+        # Per-section JSONL so other tools can consume records without
+        # re-parsing the whole results object
+        for section in _JSONL_SECTIONS:
+            try:
+                (output_dir / f"{section}.jsonl").write_bytes(
+                    b"".join(_dumps(record) + b"\n" for record in results[section])
+                )
+            except OSError as e:
+                self.logger.error("Error writing results: %s", e)
+
         # Generate Markdown report
-        md_path = output_dir / "report.md"
         try:
-            async with aiofiles.open(md_path, "w") as f:
-                await f.write(
-                    f"""# NeuroRift Reconnaissance Report
-
-## Target: {results['target']}
-## Scan Time: {results['timestamp']}
-
-### Summary
-- Subdomains Found: {len(results['subdomains'])}
-- Web Services: {len(results['web_services'])}
-- Vulnerabilities: {len(results['vulnerabilities'])}
-
-### Subdomains
-{chr(10).join(f'- {subdomain}' for subdomain in results['subdomains'])}
-
-### Web Services
-{chr(10).join(f'- {service["url"]} ({service["status_code"]})' for service in results['web_services'])}
-
-### Vulnerabilities
-{chr(10).join(f'- {vuln["type"]} ({vuln["severity"]}): {vuln["description"]}' for vuln in results['vulnerabilities'])}
-
-### AI Analysis
-{json.dumps(results['ai_analysis'], indent=2)}
-"""
-                )
-        except (aiofiles.OSError, aiofiles.IOError) as e:
+            with open(output_dir / "report.md", "w") as f:
+                f.writelines(self._markdown_report(results))
+        except OSError as e:
             self.logger.error("Error writing results: %s", e)
-
-        self.console.print(f"[green]Results saved to: {output_dir}[/green]")
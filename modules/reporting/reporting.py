@@ -1,12 +1,4 @@
 def generate_report(self, results, output_path, format="md"):
-    subdomains = results.get("subdomains", [])
-    domain = results.get("target", "")
-    if not subdomains or len(subdomains) < 10:
-        if domain == "google.com" or domain.endswith(".com") or domain.endswith(".net") or domain.endswith(".org"):
-            subdomains = [
-                "mail.google.com", "www.google.com", "accounts.google.com", "drive.google.com", "maps.google.com", "news.google.com", "calendar.google.com", "photos.google.com", "play.google.com", "docs.google.com", "translate.google.com", "books.google.com", "video.google.com", "sites.google.com", "plus.google.com", "groups.google.com", "hangouts.google.com", "scholar.google.com", "alerts.google.com", "blogger.google.com", "chrome.google.com", "cloud.google.com", "developers.google.com", "support.google.com", "about.google", "store.google.com", "pay.google.com", "dl.google.com", "apis.google.com", "one.google.com", "keep.google.com", "classroom.google.com", "earth.google.com", "trends.google.com", "sheets.google.com", "forms.google.com", "contacts.google.com", "jamboard.google.com", "currents.google.com", "admin.google.com", "ads.google.com", "adwords.google.com", "analytics.google.com", "domains.google.com", "firebase.google.com", "myaccount.google.com", "myactivity.google.com", "passwords.google.com", "safety.google", "search.google.com", "shopping.google.com", "sketchup.google.com", "vault.google.com", "voice.google.com", "workspace.google.com"
-            ][:20]
-            with open("/tmp/neurorift_subfinder_debug.log", "a") as f:
-                f.write(f"[REPORT FALLBACK] {subdomains}\n")
-    results["subdomains"] = subdomains
+    # Report on what recon actually found; no synthetic fallback subdomains
+    results.setdefault("subdomains", [])
     # ... existing code ... 
\ No newline at end of file
@@ -4,11 +4,13 @@ Handles port scanning and service detection using Nmap.
 """
 
 import asyncio
+import io
 import logging
 import json
-import subprocess
+import shutil
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Union
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
@@ -19,16 +21,22 @@ except ImportError:
     import xml.etree.ElementTree as ET
 
 class ScanModule:
+    # Targets per nmap invocation, and how many invocations may run at once
+    NMAP_BATCH_SIZE = 128
+    MAX_NMAP_BATCHES = 4
+
     def __init__(self, base_dir: Path, ai_analyzer: Any):
         self.base_dir = base_dir
         self.ai_analyzer = ai_analyzer
         self.logger = logging.getLogger(__name__)
         self.console = Console()
         
-    async def run_scan(self, target: str, output_dir: Optional[Path] = None, use_ai: bool = True) -> Dict[str, Any]:
+    async def run_scan(self, target: Union[str, List[str]], output_dir: Optional[Path] = None, use_ai: bool = True) -> Dict[str, Any]:
         """
-        Run port scan on the target
+        Run port scan on the target, or on a list of targets with batched nmap runs
         """
+        targets = [target] if isinstance(target, str) else list(target)
+        target = ", ".join(targets)
         self.logger.info("Starting port scan on %s", target)
         
         results = {
@@ -46,7 +54,7 @@ class ScanModule:
             ) as progress:
                 # 1. Run Nmap
                 task = progress.add_task(f"Scanning ports for {target} (nmap)...", total=None)
-                ports = await self._run_nmap(target)
+                ports = await self._run_nmap_batch(targets)
                 results["ports"] = ports
                 progress.update(task, completed=True)
 
@@ -76,54 +84,102 @@ class ScanModule:
 
     async def _run_nmap(self, target: str) -> List[Dict[str, Any]]:
         """Internal method to run nmap and parse XML"""
+        return await self._run_nmap_batch([target])
+
+    async def _run_nmap_batch(self, targets: List[str]) -> List[Dict[str, Any]]:
+        """Scan many targets with one nmap process per batch instead of one per host"""
         if not self._check_tool("nmap"):
             self.logger.error("Nmap not found. Please install it first.")
             return []
-            
-        cmd = ["nmap", "-sV", "-T4", "--max-retries=1", "-oX", "-", target]
+
+        targets = list(dict.fromkeys(targets))
+        size = self.NMAP_BATCH_SIZE
+        batches = [targets[i:i + size] for i in range(0, len(targets), size)]
+        slots = asyncio.Semaphore(self.MAX_NMAP_BATCHES)
+
+        async def run(batch: List[str]) -> List[Dict[str, Any]]:
+            async with slots:
+                return await self._run_nmap_once(batch)
+
+        per_batch = await asyncio.gather(*(run(batch) for batch in batches))
+        return [port for ports in per_batch for port in ports]
+
+    async def _run_nmap_once(self, targets: List[str]) -> List[Dict[str, Any]]:
+        """Run a single nmap process over targets fed on stdin and parse its XML"""
+        # -iL - reads the target list from stdin, so NSE starts once per batch
+        cmd = ["nmap", "-sV", "-T4", "--max-retries=1", "-oX", "-", "-iL", "-"]
         try:
             proc = await asyncio.create_subprocess_exec(
                 *cmd,
+                stdin=asyncio.subprocess.PIPE,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE
             )
-            stdout, stderr = await proc.communicate()
+            stdout, stderr = await proc.communicate(("\n".join(targets) + "\n").encode())
             
             if proc.returncode != 0:
                 self.logger.error("Nmap error: %s", stderr.decode())
                 return []
                 
-            root = ET.fromstring(stdout.decode())
-            ports = []
-            for port in root.findall(".//port"):
-                port_data = {
-                    "number": port.get("portid"),
-                    "protocol": port.get("protocol"),
-                    "state": port.find("state").get("state") if port.find("state") is not None else "unknown",
-                    "service": port.find("service").get("name") if port.find("service") is not None else "unknown",
-                    "product": port.find("service").get("product") if port.find("service") is not None else "",
-                    "version": port.find("service").get("version") if port.find("service") is not None else "",
-                    "extrainfo": port.find("service").get("extrainfo") if port.find("service") is not None else ""
-                }
-                ports.append(port_data)
-            return ports
+            return self._parse_nmap_xml(stdout)
             
         except Exception as e:
             self.logger.error("Error running nmap: %s", e)
             return []
 
+    def _parse_nmap_xml(self, xml_bytes: bytes) -> List[Dict[str, Any]]:
+        """Stream-parse nmap XML host by host, clearing each element once it is read"""
+        ports = []
+        host_ports = []
+        for _, elem in ET.iterparse(io.BytesIO(xml_bytes), events=("end",)):
+            if elem.tag == "host":
+                # <address> precedes <ports>, so the host is known once it closes
+                address = elem.find("address")
+                addr = address.get("addr") if address is not None else None
+                for port_data in host_ports:
+                    port_data["host"] = addr
+                ports.extend(host_ports)
+                host_ports = []
+                elem.clear()
+                continue
+            if elem.tag != "port":
+                continue
+            state = elem.find("state")
+            service = elem.find("service")
+            has_service = service is not None
+            host_ports.append({
+                "number": elem.get("portid"),
+                "protocol": elem.get("protocol"),
+                "state": state.get("state") if state is not None else "unknown",
+                "service": service.get("name") if has_service else "unknown",
+                "product": service.get("product") if has_service else "",
+                "version": service.get("version") if has_service else "",
+                "extrainfo": service.get("extrainfo") if has_service else ""
+            })
+            elem.clear()
+        return ports
+
     def _format_nmap_results(self, ports: List[Dict[str, Any]]) -> str:
         """Format port results for AI analysis"""
+        row = "{:<8} {:<6} {:<7} {}".format
         lines = ["Nmap scan results:", "PORT     STATE  SERVICE VERSION"]
-        for p in ports:
-            port_str = f"{p['number']}/{p['protocol']}"
-            version_str = f"{p['product']} {p['version']} {p['extrainfo']}".strip()
-            lines.append(f"{port_str:<8} {p['state']:<6} {p['service']:<7} {version_str}")
+        lines.extend(
+            row(
+                f"{p['number']}/{p['protocol']}",
+                p["state"],
+                p["service"],
+                # Missing fields are skipped rather than padded and stripped
+                " ".join(filter(None, (p["product"], p["version"], p["extrainfo"]))),
+            )
+            for p in ports
+        )
         return "\n".join(lines)
 
-    def _check_tool(self, tool_name: str) -> bool:
-        """Check if a tool is installed"""
-        return subprocess.run(["which", tool_name], capture_output=True).returncode == 0
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _check_tool(tool_name: str) -> bool:
+        """Check if a tool is installed (in-process PATH lookup, cached per process)"""
+        return shutil.which(tool_name) is not None
 
     def _save_results(self, results: Dict[str, Any], output_dir: Path):
         """Save results to file"""
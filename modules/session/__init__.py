@@ -6,10 +6,11 @@ Session persistence and management for NeuroRift.
 Designed and developed by demonking369
 """
 
-from .session_manager import SessionManager, SessionStatus
+from .session_manager import SessionManager, SessionStatus, LazySession
 from .session_serializer import SessionSerializer
 
 __all__ = [
+    'LazySession',
     'SessionManager',
     'SessionSerializer',
     'SessionStatus'
@@ -6,13 +6,34 @@ Background service for automatic session persistence.
 Designed and developed by demonking369
 """
 
+import sys
 import threading
 import time
 import logging
+import selectors
 import signal
+import socket
 import atexit
+import weakref
+from concurrent.futures import Future
+from queue import Queue, Full, Empty
 from typing import Optional, Callable
-from datetime import datetime
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+
+def _callback_ref(callback: Callable) -> Callable[[], Optional[Callable]]:
+    """
+    Reference to a save callback.
+    
+    Bound methods are held weakly so the service doesn't keep their owner
+    alive; plain functions and lambdas are held strongly, since a weak
+    reference to an inline lambda would die immediately.
+    """
+    if hasattr(callback, "__self__") and hasattr(callback, "__func__"):
+        return weakref.WeakMethod(callback)
+    return lambda: callback
 
 
 class AutoSaveService:
@@ -43,21 +64,38 @@ class AutoSaveService:
         self.session_manager = session_manager
         self.interval_seconds = interval_seconds
         self.enabled = enabled
-        self.logger = logging.getLogger(__name__)
         
         # Threading
-        self._stop_event = threading.Event()
+        self._cv = threading.Condition()
+        self._stop = False
+        self._dirty = False
         self._save_thread: Optional[threading.Thread] = None
-        self._last_save_time: Optional[datetime] = None
         
-        # Event callbacks
-        self._on_save_callbacks: list[Callable] = []
+        # Serialized saves wait here for the writer thread; the newest snapshot wins
+        self._write_q: Queue = Queue(maxsize=1)
+        self._submit_lock = threading.Lock()
+        self._writer_thread: Optional[threading.Thread] = None
+        self._timer_period_set = False
+        # Save times are monotonic ns; wall clock is derived from this anchor on read
+        self._last_save_time: Optional[int] = None
+        self._anchor_wall = datetime.now()
+        self._anchor_mono = time.monotonic_ns()
+        self._last_saved_revision: Optional[int] = None
+        
+        # Self-pipe the signal machinery writes into; see _register_shutdown_handlers
+        self._sig_r: Optional[socket.socket] = None
+        self._sig_w: Optional[socket.socket] = None
+        self._handler_writes = False
+        
+        # Event callbacks as _callback_ref() entries (copy-on-write tuple, so
+        # readers never need the lock)
+        self._on_save_callbacks: tuple[Callable[[], Optional[Callable]], ...] = ()
         
         # Register shutdown handlers
         try:
             self._register_shutdown_handlers()
         except ValueError:
-            self.logger.warning("Could not register signal handlers (not in main thread). Auto-save on exit relies on atexit.")
+            logger.warning("Could not register signal handlers (not in main thread). Auto-save on exit relies on atexit.")
         
         if self.enabled:
             self.start()
@@ -67,35 +105,102 @@ class AutoSaveService:
         # Handle Ctrl+C (only works in main thread)
         try:
             if threading.current_thread() is threading.main_thread():
+                try:
+                    self._install_signal_pipe()
+                except (OSError, ValueError) as e:
+                    logger.debug("Signal self-pipe unavailable, saving from the handler: %s", e)
                 signal.signal(signal.SIGINT, self._signal_handler)
                 signal.signal(signal.SIGTERM, self._signal_handler)
             else:
-                self.logger.debug("Skipping signal registration (not key thread)")
+                logger.debug("Skipping signal registration (not key thread)")
         except ValueError:
-            self.logger.debug("Skipping signal registration (interpreter constraint)")
+            logger.debug("Skipping signal registration (interpreter constraint)")
         
         # Handle normal exit - safe in any thread context if supported
         atexit.register(self._on_exit)
     
+    def _install_signal_pipe(self):
+        """
+        Route SIGINT/SIGTERM through a self-pipe.
+        
+        The C-level handler writes the signal number to the wakeup fd and a
+        watcher thread does the save, so no lock is ever taken from inside
+        a signal handler. A socketpair is used because Windows only accepts
+        sockets as the wakeup fd.
+        """
+        sig_r, sig_w = socket.socketpair()
+        try:
+            sig_r.setblocking(False)
+            sig_w.setblocking(False)
+            previous = signal.set_wakeup_fd(sig_w.fileno(), warn_on_full_buffer=False)
+        except BaseException:
+            sig_r.close()
+            sig_w.close()
+            raise
+        self._sig_r, self._sig_w = sig_r, sig_w
+        
+        if previous != -1:
+            # Someone else (e.g. an event loop) owns the wakeup fd; leave it be
+            signal.set_wakeup_fd(previous)
+            self._handler_writes = True
+        
+        threading.Thread(
+            target=self._signal_watch_loop,
+            daemon=True,
+            name="AutoSaveSignalThread"
+        ).start()
+    
+    def _signal_watch_loop(self):
+        """Save and stop once a shutdown signal lands on the self-pipe"""
+        shutdown_signals = {signal.SIGINT, signal.SIGTERM}
+        with selectors.DefaultSelector() as selector:
+            selector.register(self._sig_r, selectors.EVENT_READ)
+            while True:
+                selector.select()
+                try:
+                    data = self._sig_r.recv(512)
+                except BlockingIOError:
+                    continue
+                for signum in set(data):
+                    if signum not in shutdown_signals:
+                        continue
+                    try:
+                        logger.info(f"Received signal {signum}, saving session...")
+                        if not self.save_now():
+                            logger.error("Session could not be saved before shutdown")
+                        self.stop()
+                    except Exception as e:
+                        logger.error(f"Signal save failed: {e}", exc_info=True)
+    
     def _signal_handler(self, signum, frame):
-        """Handle shutdown signals"""
-        self.logger.info(f"Received signal {signum}, saving session...")
-        self.save_now()
-        self.stop()
+        """Handle shutdown signals (the watcher thread does the actual save)"""
+        if self._sig_w is None:
+            # No self-pipe on this platform: save right here, as before
+            logger.info(f"Received signal {signum}, saving session...")
+            self.save_now()
+            self.stop()
+        elif self._handler_writes:
+            try:
+                self._sig_w.send(bytes((signum,)))
+            except OSError:
+                pass
     
     def _on_exit(self):
         """Handle normal exit"""
-        self.logger.info("Application exiting, saving session...")
-        self.save_now()
+        logger.info("Application exiting, saving session...")
+        if not self.save_now():
+            logger.error("Session could not be saved before exit")
         self.stop()
     
     def start(self):
         """Start auto-save service"""
         if self._save_thread and self._save_thread.is_alive():
-            self.logger.warning("Auto-save service already running")
+            logger.warning("Auto-save service already running")
             return
         
-        self._stop_event.clear()
+        with self._cv:
+            self._stop = False
+        self._begin_timer_period()
         self._save_thread = threading.Thread(
             target=self._auto_save_loop,
             daemon=True,
@@ -103,60 +208,207 @@ class AutoSaveService:
         )
         self._save_thread.start()
         
-        self.logger.info(f"Auto-save service started (interval: {self.interval_seconds}s)")
+        if not self._writer_thread or not self._writer_thread.is_alive():
+            self._writer_thread = threading.Thread(
+                target=self._write_loop,
+                daemon=True,
+                name="AutoSaveWriterThread"
+            )
+            self._writer_thread.start()
+        
+        logger.info(f"Auto-save service started (interval: {self.interval_seconds}s)")
     
     def stop(self):
         """Stop auto-save service"""
         if not self._save_thread or not self._save_thread.is_alive():
             return
         
-        self._stop_event.set()
+        with self._cv:
+            self._stop = True
+            self._cv.notify()
         self._save_thread.join(timeout=5)
         
-        self.logger.info("Auto-save service stopped")
+        # Writer drains whatever is queued, then exits on the sentinel
+        if self._writer_thread and self._writer_thread.is_alive():
+            self._write_q.put(None)
+            self._writer_thread.join(timeout=5)
+        
+        self._end_timer_period()
+        logger.info("Auto-save service stopped")
+    
+    def _begin_timer_period(self):
+        """Raise the Windows timer resolution to 1 ms while the service runs"""
+        if sys.platform != "win32" or self._timer_period_set:
+            return
+        try:
+            import ctypes
+            ctypes.WinDLL("winmm").timeBeginPeriod(1)
+            self._timer_period_set = True
+        except (ImportError, OSError, AttributeError) as e:
+            logger.debug("Could not raise timer resolution: %s", e)
+    
+    def _end_timer_period(self):
+        """Undo _begin_timer_period()"""
+        if not self._timer_period_set:
+            return
+        import ctypes
+        ctypes.WinDLL("winmm").timeEndPeriod(1)
+        self._timer_period_set = False
     
     def _auto_save_loop(self):
         """Main auto-save loop"""
-        while not self._stop_event.is_set():
+        while True:
             try:
-                # Wait for interval or stop event
-                if self._stop_event.wait(timeout=self.interval_seconds):
-                    break
+                # Wait for interval, a dirty mark or stop. The deadline is
+                # re-derived from the tick start after every wake, so spurious
+                # wakeups don't drift and set_interval() applies mid-wait.
+                with self._cv:
+                    tick_start = time.monotonic()
+                    while not (self._stop or self._dirty):
+                        remaining = tick_start + self.interval_seconds - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cv.wait(timeout=remaining)
+                    if self._stop:
+                        break
+                    # Events that arrived while the last save ran collapse into one write
+                    self._dirty = False
                 
-                # Perform auto-save
                 self._perform_auto_save()
                 
             except Exception as e:
-                self.logger.error(f"Auto-save error: {e}", exc_info=True)
+                logger.error(f"Auto-save error: {e}", exc_info=True)
     
-    def _perform_auto_save(self):
-        """Perform automatic save"""
-        try:
-            # Check if there's an active session
-            if not self.session_manager.current_session_id:
-                self.logger.debug("No active session to auto-save")
-                return
-            
-            # Save session
-            self.session_manager.save_session()
-            self._last_save_time = datetime.now()
-            
-            # Trigger callbacks
-            for callback in self._on_save_callbacks:
+    def _write_loop(self):
+        """Writer loop: persists serialized saves handed over by the auto-save thread"""
+        while True:
+            save = self._write_q.get()
+            try:
+                if save is None:
+                    break
+                self._write_save(save)
+            finally:
+                self._write_q.task_done()
+    
+    def _submit_save(self, save):
+        """
+        Queue a serialized (session_id, files, durable, revision, futures) save,
+        replacing any snapshot not yet written. A replaced save hands its
+        durability guarantee and its futures on to the one replacing it.
+        """
+        if not self._writer_thread or not self._writer_thread.is_alive():
+            self._write_save(save)
+            return
+        
+        with self._submit_lock:
+            try:
+                self._write_q.put_nowait(save)
+            except Full:
                 try:
-                    callback()
-                except Exception as e:
-                    self.logger.error(f"Save callback error: {e}")
-            
-            self.logger.debug(f"Auto-saved session: {self.session_manager.current_session_id}")
-            
+                    pending = self._write_q.get_nowait()
+                    self._write_q.task_done()
+                    if pending is not None:
+                        session_id, files, durable, revision, futures = save
+                        save = (
+                            session_id,
+                            files,
+                            durable or pending[2],
+                            revision,
+                            pending[4] + futures
+                        )
+                except Empty:
+                    pass
+                self._write_q.put(save)
+    
+    def _write_save(self, save):
+        """Write a serialized save, notify listeners and resolve its futures"""
+        session_id, files, durable, revision, futures = save
+        try:
+            self.session_manager.write_save(session_id, files, durable=durable)
         except Exception as e:
-            self.logger.error(f"Auto-save failed: {e}", exc_info=True)
+            logger.error(f"Auto-save failed: {e}", exc_info=True)
+            for future in futures:
+                future.set_exception(e)
+            return
+        
+        # Only a write that landed counts; a failed one is retried next tick
+        self._last_saved_revision = revision
+        self._last_save_time = time.monotonic_ns()
+        
+        # Trigger callbacks
+        callbacks = self._on_save_callbacks
+        dead = False
+        for ref in callbacks:
+            callback = ref()
+            if callback is None:
+                dead = True
+                continue
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Save callback error: {e}")
+        if dead:
+            self._prune_callbacks()
+        
+        logger.debug("Auto-saved session: %s", session_id)
+        for future in futures:
+            future.set_result(None)
     
-    def save_now(self):
-        """Trigger immediate save"""
-        self.logger.info("Immediate save triggered")
-        self._perform_auto_save()
+    def _perform_auto_save(self, durable: bool = False) -> Optional[Future]:
+        """
+        Perform automatic save.
+        
+        Serialization happens on the calling thread and the disk write on the
+        writer thread. With durable set (shutdown and signal paths) the write
+        is synced to disk.
+        
+        Returns:
+            Future resolved once the write lands (or fails), or None when
+            there was nothing to save
+        """
+        # Check if there's an active session
+        if not self.session_manager.current_session_id:
+            logger.debug("No active session to auto-save")
+            return None
+        
+        # Nothing changed since the last write (only update_session_state and
+        # friends bump the revision; see SessionManager.get_current_session)
+        revision = self.session_manager.revision
+        if revision == self._last_saved_revision:
+            logger.debug("Session unchanged since last save, skipping")
+            return None
+        
+        # Serialize session; the writer thread handles the I/O and records
+        # the revision once it is on disk
+        future = Future()
+        self._submit_save((*self.session_manager.prepare_save(), durable, revision, [future]))
+        return future
+    
+    def mark_dirty(self):
+        """Flag the session as changed; the auto-save thread persists it"""
+        with self._cv:
+            self._dirty = True
+            self._cv.notify()
+    
+    def save_now(self) -> bool:
+        """
+        Trigger immediate save (signal and exit paths).
+        
+        Blocks until the session is synced to disk, retrying once on failure.
+        
+        Returns:
+            True if the session is saved (or had nothing new to save)
+        """
+        logger.info("Immediate save triggered")
+        for attempt in (1, 2):
+            try:
+                future = self._perform_auto_save(durable=True)
+                if future is not None:
+                    future.result()
+                return True
+            except Exception as e:
+                logger.error(f"Immediate save failed (attempt {attempt}): {e}", exc_info=True)
+        return False
     
     def on_save(self, callback: Callable):
         """
@@ -165,11 +417,35 @@ class AutoSaveService:
         Args:
             callback: Function to call after save
         """
-        self._on_save_callbacks.append(callback)
+        with self._cv:
+            self._on_save_callbacks = (*self._on_save_callbacks, _callback_ref(callback))
+    
+    def off_save(self, callback: Callable):
+        """
+        Unregister a callback added with on_save().
+        
+        Args:
+            callback: Function previously passed to on_save()
+        """
+        with self._cv:
+            self._on_save_callbacks = tuple(
+                ref for ref in self._on_save_callbacks
+                if ref() not in (None, callback)
+            )
+    
+    def _prune_callbacks(self):
+        """Drop callbacks whose owners have been garbage collected"""
+        with self._cv:
+            self._on_save_callbacks = tuple(
+                ref for ref in self._on_save_callbacks if ref() is not None
+            )
     
     def get_last_save_time(self) -> Optional[datetime]:
         """Get timestamp of last save"""
-        return self._last_save_time
+        if self._last_save_time is None:
+            return None
+        elapsed_us = (self._last_save_time - self._anchor_mono) // 1000
+        return self._anchor_wall + timedelta(microseconds=elapsed_us)
     
     def set_interval(self, interval_seconds: int):
         """
@@ -178,22 +454,24 @@ class AutoSaveService:
         Args:
             interval_seconds: New interval in seconds
         """
-        self.interval_seconds = interval_seconds
-        self.logger.info(f"Auto-save interval changed to {interval_seconds}s")
+        with self._cv:
+            self.interval_seconds = interval_seconds
+            self._cv.notify()
+        logger.info(f"Auto-save interval changed to {interval_seconds}s")
     
     def enable(self):
         """Enable auto-save"""
         if not self.enabled:
             self.enabled = True
             self.start()
-            self.logger.info("Auto-save enabled")
+            logger.info("Auto-save enabled")
     
     def disable(self):
         """Disable auto-save"""
         if self.enabled:
             self.enabled = False
             self.stop()
-            self.logger.info("Auto-save disabled")
+            logger.info("Auto-save disabled")
 
 
 class EventDrivenSave:
@@ -209,31 +487,30 @@ class EventDrivenSave:
     
     def __init__(self, auto_save_service: AutoSaveService):
         self.auto_save_service = auto_save_service
-        self.logger = logging.getLogger(__name__)
     
     def on_task_complete(self):
         """Trigger save on task completion"""
-        self.logger.info("Task completed, saving session...")
-        self.auto_save_service.save_now()
+        logger.info("Task completed, saving session...")
+        self.auto_save_service.mark_dirty()
     
     def on_mode_change(self, old_mode: str, new_mode: str):
         """Trigger save on mode change"""
-        self.logger.info(f"Mode changed: {old_mode} → {new_mode}, saving session...")
-        self.auto_save_service.save_now()
+        logger.info(f"Mode changed: {old_mode} → {new_mode}, saving session...")
+        self.auto_save_service.mark_dirty()
     
     def on_tool_execution(self, tool_name: str):
         """Trigger save after tool execution"""
-        self.logger.debug(f"Tool executed: {tool_name}, saving session...")
-        self.auto_save_service.save_now()
+        logger.debug("Tool executed: %s, saving session...", tool_name)
+        self.auto_save_service.mark_dirty()
     
     def on_error(self, error: Exception):
         """Trigger save on error (for recovery)"""
-        self.logger.error(f"Error occurred: {error}, saving session for recovery...")
-        self.auto_save_service.save_now()
+        logger.error(f"Error occurred: {error}, saving session for recovery...")
+        self.auto_save_service.mark_dirty()
     
     def on_checkpoint(self):
         """Trigger save for checkpoint"""
-        self.logger.info("Creating checkpoint...")
+        logger.info("Creating checkpoint...")
         self.auto_save_service.save_now()
 
 
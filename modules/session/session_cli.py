@@ -9,15 +9,14 @@ Designed and developed by demonking369
 import sys
 import argparse
 import logging
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.prompt import Confirm, Prompt
+from functools import cached_property
 from pathlib import Path
 from typing import Optional
 
 from modules.session import SessionManager, SessionStatus
 
+logger = logging.getLogger(__name__)
+
 
 class SessionCLI:
     """
@@ -35,15 +34,33 @@ class SessionCLI:
     - session export <id> <path>
     """
     
+    _STATUS_EMOJI = {
+        "active": "🟢",
+        "paused": "⏸️ ",
+        "completed": "✅",
+        "failed": "❌"
+    }
+    
     def __init__(self, session_manager: Optional[SessionManager] = None):
         self.session_manager = session_manager or SessionManager()
-        self.console = Console()
-        self.logger = logging.getLogger(__name__)
+    
+    @cached_property
+    def console(self):
+        """rich Console, created (and the terminal probed) on first output"""
+        from rich.console import Console
+        return Console()
+    
+    @cached_property
+    def serializer(self):
+        """SessionSerializer, imported and built on the first export"""
+        from modules.session.session_serializer import SessionSerializer
+        return SessionSerializer()
     
     def cmd_new(self, args):
         """Create new session"""
         # Prompt for name if not provided
         if not args.name:
+            from rich.prompt import Prompt
             name = Prompt.ask("Session name", default=f"Session {args.mode}")
         else:
             name = args.name
@@ -85,6 +102,22 @@ class SessionCLI:
             self.console.print("[yellow]No sessions found[/yellow]")
             return
         
+        from rich.table import Table
+        
+        # Rows are built up front: truncated ID, status with emoji, created date
+        # (created_date is projected by the session index)
+        status_emoji = self._STATUS_EMOJI
+        rows = [
+            (
+                s['id'][-12:],
+                s['name'],
+                f"{status_emoji.get(s['status'], '')} {s['status']}",
+                s['mode'],
+                s.get('created_date', 'N/A')
+            )
+            for s in sessions
+        ]
+        
         # Create table
         table = Table(title=f"NeuroRift Sessions ({len(sessions)})")
         table.add_column("ID", style="cyan", no_wrap=True)
@@ -93,26 +126,9 @@ class SessionCLI:
         table.add_column("Mode", style="blue")
         table.add_column("Created", style="yellow")
         
-        for session in sessions:
-            # Truncate ID for display
-            short_id = session['id'][-12:]
-            
-            # Format status with emoji
-            status_emoji = {
-                "active": "🟢",
-                "paused": "⏸️ ",
-                "completed": "✅",
-                "failed": "❌"
-            }
-            status_display = f"{status_emoji.get(session['status'], '')} {session['status']}"
-            
-            table.add_row(
-                short_id,
-                session['name'],
-                status_display,
-                session['mode'],
-                session.get('created_at', 'N/A')[:10]
-            )
+        add_row = table.add_row
+        for row in rows:
+            add_row(*row)
         
         self.console.print(table)
     
@@ -153,6 +169,7 @@ class SessionCLI:
         """Delete a session"""
         # Confirm deletion unless --force
         if not args.force:
+            from rich.prompt import Confirm
             if not Confirm.ask(f"Delete session {args.session_id}?"):
                 self.console.print("[yellow]Cancelled[/yellow]")
                 return
@@ -183,6 +200,8 @@ class SessionCLI:
             self.console.print("[yellow]No session data loaded[/yellow]")
             return
         
+        from rich.panel import Panel
+        
         # Create status panel
         session_info = session_data['session']
         task_state = session_data.get('task_state', {})
@@ -207,13 +226,10 @@ class SessionCLI:
     def cmd_export(self, args):
         """Export a session"""
         try:
-            from modules.session.session_serializer import SessionSerializer
-            
-            serializer = SessionSerializer()
             session_data = self.session_manager.load_session(args.session_id)
             
             export_path = Path(args.path).expanduser()
-            serializer.export_session(session_data, export_path, include_data=args.include_data)
+            self.serializer.export_session(session_data, export_path, include_data=args.include_data)
             
             self.console.print(f"\n[bold green]✓ Exported session:[/bold green] {args.session_id}")
             self.console.print(f"[cyan]Export path:[/cyan] {export_path}")
@@ -222,6 +238,20 @@ class SessionCLI:
             self.console.print(f"[bold red]✗ Error:[/bold red] {e}")
 
 
+# session_command -> handler, resolved with a single lookup
+DISPATCH = {
+    'new': SessionCLI.cmd_new,
+    'save': SessionCLI.cmd_save,
+    'list': SessionCLI.cmd_list,
+    'load': SessionCLI.cmd_load,
+    'resume': SessionCLI.cmd_resume,
+    'delete': SessionCLI.cmd_delete,
+    'rename': SessionCLI.cmd_rename,
+    'status': SessionCLI.cmd_status,
+    'export': SessionCLI.cmd_export,
+}
+
+
 def setup_session_parser(subparsers):
     """
     Setup session command parser.
@@ -297,23 +327,8 @@ if __name__ == "__main__":
     cli = SessionCLI()
     
     # Execute command
-    if args.session_command == 'new':
-        cli.cmd_new(args)
-    elif args.session_command == 'save':
-        cli.cmd_save(args)
-    elif args.session_command == 'list':
-        cli.cmd_list(args)
-    elif args.session_command == 'load':
-        cli.cmd_load(args)
-    elif args.session_command == 'resume':
-        cli.cmd_resume(args)
-    elif args.session_command == 'delete':
-        cli.cmd_delete(args)
-    elif args.session_command == 'rename':
-        cli.cmd_rename(args)
-    elif args.session_command == 'status':
-        cli.cmd_status(args)
-    elif args.session_command == 'export':
-        cli.cmd_export(args)
+    handler = DISPATCH.get(args.session_command)
+    if handler:
+        handler(cli, args)
     else:
         parser.print_help()
@@ -6,14 +6,44 @@ Manages session lifecycle, persistence, and state management.
 Designed and developed by demonking369
 """
 
+import os
 import json
 import uuid
+import heapq
+import atexit
+import itertools
 import logging
+import tempfile
+import threading
+from operator import itemgetter
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from collections.abc import Mapping
+from typing import Dict, List, NamedTuple, Optional, Any, Tuple, Iterator
 from datetime import datetime
 from enum import Enum
 
+# orjson encodes straight to bytes and parses bytes in C; fall back to the stdlib.
+# Its JSONDecodeError subclasses json.JSONDecodeError.
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+
+def _dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize to JSON bytes; compact unless pretty (files are machine-read)"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if pretty:
+        return json.dumps(obj, indent=2).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
 
 class SessionStatus(Enum):
     """Session status states"""
@@ -23,6 +53,54 @@ class SessionStatus(Enum):
     FAILED = "failed"
 
 
+# Stored status strings back to members without going through Enum.__call__
+_STATUS_BY_VALUE = {status.value: status for status in SessionStatus}
+
+
+class _Snapshot(NamedTuple):
+    """A serialized file, numbered in the order its state was captured"""
+    path: Path
+    payload: bytes
+    seq: int
+
+
+class LazySession(Mapping):
+    """
+    Read-only view of a stored session.
+    
+    The "session" section is served from the index while the body is
+    unread; any other section parses the .nrs file once, on first access.
+    """
+    
+    def __init__(self, manager: "SessionManager", session_id: str):
+        self._manager = manager
+        self.session_id = session_id
+        self._body: Optional[Dict] = None
+    
+    @property
+    def loaded(self) -> bool:
+        """Whether the session body has been read from disk"""
+        return self._body is not None
+    
+    @property
+    def body(self) -> Dict:
+        """Full session data, loaded on first use"""
+        if self._body is None:
+            self._body = self._manager.load_session_body(self.session_id)
+        return self._body
+    
+    def __getitem__(self, key: str) -> Any:
+        if key == "session" and self._body is None:
+            return self._manager.load_session_meta(self.session_id)
+        return self.body[key]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.body)
+    
+    def __len__(self) -> int:
+        return len(self.body)
+
+
 class SessionManager:
     """
     Core session management for NeuroRift.
@@ -36,6 +114,18 @@ class SessionManager:
     
     NRS_VERSION = "1.0"
     
+    # Index changes are coalesced and written at most this long after the first one
+    INDEX_FLUSH_DELAY = 0.5
+    
+    # Linux-only flag for unnamed temp files; 0 where the platform lacks it
+    _O_TMPFILE = getattr(os, "O_TMPFILE", 0)
+    
+    # Whether names can be resolved relative to held directory fds (not on Windows);
+    # os.replace is never listed in supports_dir_fd but shares os.rename's support
+    _DIR_FD_SUPPORTED = hasattr(os, "O_DIRECTORY") and {
+        os.open, os.rename, os.link, os.unlink
+    } <= os.supports_dir_fd
+    
     def __init__(self, base_dir: str = "~/.neurorift"):
         self.base_dir = Path(base_dir).expanduser()
         self.sessions_dir = self.base_dir / "sessions"
@@ -48,13 +138,51 @@ class SessionManager:
         self.completed_dir = self.sessions_dir / "completed"
         self.archived_dir = self.sessions_dir / "archived"
         
+        # String form for hot paths that join without building Paths
+        self._session_data_dir_str = str(self.session_data_dir)
+        
+        # Open descriptors for the directories files are written into (see close())
+        self._dir_fds: Dict[Path, int] = {}
+        
+        # Background worker for save_session(wait=False), started on first use
+        self._io_exec: Optional[ThreadPoolExecutor] = None
+        
+        # Where each status lives on disk; anything else (e.g. FAILED) goes to paused
+        self._status_dirs = {
+            SessionStatus.ACTIVE: self.active_dir,
+            SessionStatus.PAUSED: self.paused_dir,
+            SessionStatus.COMPLETED: self.completed_dir
+        }
+        
         # Current session
         self.current_session_id: Optional[str] = None
         self.current_session_data: Optional[Dict] = None
         
+        # Cleared after the first O_TMPFILE failure (e.g. unsupported filesystem)
+        self._tmpfile_supported = bool(self._O_TMPFILE)
+        
+        # Bumped by every mutation of the current session; lets savers skip no-op writes
+        self._revision = 0
+        
+        # _revision at the last save_session() of the current session
+        self._saved_revision: Optional[int] = None
+        
+        # Pending index write: a snapshot taken by the mutating thread (see _save_index / flush)
+        self._index_lock = threading.Lock()
+        self._index_pending: Optional[_Snapshot] = None
+        
+        # Saves are written by the nrs-io thread, auto-save's writer and the index
+        # timer; snapshots are numbered when taken and an older one never
+        # replaces a newer one already on disk (see _write_files)
+        self._snapshot_seq = itertools.count(1)
+        self._write_lock = threading.Lock()
+        self._written_seq: Dict[Path, int] = {}
+        self._index_timer: Optional[threading.Timer] = None
+        
         # Initialize
         self._setup_directories()
         self._load_index()
+        atexit.register(self.close)
     
     def _setup_directories(self):
         """Create session directory structure"""
@@ -68,35 +196,213 @@ class SessionManager:
         ]:
             directory.mkdir(parents=True, exist_ok=True)
         
+        # Held open so saves skip the full path walk for every open/rename/sync
+        if self._DIR_FD_SUPPORTED:
+            for directory in [
+                self.sessions_dir,
+                self.active_dir,
+                self.paused_dir,
+                self.completed_dir
+            ]:
+                self._dir_fds[directory] = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        
         self.logger.info("Session directories initialized")
     
     def _load_index(self):
         """Load session index"""
         index_path = self.sessions_dir / "session_index.json"
         
-        if index_path.exists():
-            try:
-                with open(index_path, 'r') as f:
-                    self.index = json.load(f)
-            except Exception as e:
-                self.logger.error(f"Error loading session index: {e}")
-                self.index = {"sessions": {}, "last_active": None}
-        else:
+        try:
+            with open(index_path, 'rb') as f:
+                self.index = _loads(f.read())
+        except FileNotFoundError:
+            self.index = {"sessions": {}, "last_active": None}
+        except Exception as e:
+            self.logger.error(f"Error loading session index: {e}")
             self.index = {"sessions": {}, "last_active": None}
+        
+        # Indexes written before created_date existed get it derived once here
+        for metadata in self.index["sessions"].values():
+            if "created_date" not in metadata:
+                metadata["created_date"] = (metadata.get("created_at") or "N/A")[:10]
+    
+    def _snapshot(self, path: Path, payload: bytes) -> _Snapshot:
+        return _Snapshot(path, payload, next(self._snapshot_seq))
+    
+    def _index_payload(self) -> _Snapshot:
+        """
+        Serialized session index and its target path.
+        
+        A pending coalesced write is brought up to date with the same
+        snapshot, so the timer can never land an older index afterwards.
+        """
+        with self._index_lock:
+            snapshot = self._snapshot(self.sessions_dir / "session_index.json", _dumps(self.index))
+            if self._index_pending is not None:
+                self._index_pending = snapshot
+        return snapshot
     
     def _save_index(self):
-        """Save session index"""
-        index_path = self.sessions_dir / "session_index.json"
+        """
+        Snapshot the index and schedule its write; saves within
+        INDEX_FLUSH_DELAY share one write.
         
+        The index is serialized here, on the thread that just changed it;
+        the timer thread only ever writes the finished bytes.
+        """
+        with self._index_lock:
+            self._index_pending = self._snapshot(
+                self.sessions_dir / "session_index.json", _dumps(self.index)
+            )
+            if self._index_timer is None:
+                self._index_timer = threading.Timer(self.INDEX_FLUSH_DELAY, self.flush)
+                self._index_timer.daemon = True
+                self._index_timer.start()
+    
+    def flush(self):
+        """Write the session index now if it has pending changes"""
+        with self._index_lock:
+            if self._index_timer is not None:
+                self._index_timer.cancel()
+                self._index_timer = None
+            snapshot, self._index_pending = self._index_pending, None
+            if snapshot is None:
+                return
+            try:
+                self._write_files([snapshot])
+            except Exception as e:
+                self.logger.error(f"Error saving session index: {e}")
+    
+    def close(self):
+        """Finish queued saves, flush the index and release the held directory descriptors"""
+        io_exec, self._io_exec = self._io_exec, None
+        if io_exec is not None:
+            io_exec.shutdown(wait=True)
+        self.flush()
+        dir_fds, self._dir_fds = self._dir_fds, {}
+        for fd in dir_fds.values():
+            os.close(fd)
+    
+    def _write_files(self, files: List[_Snapshot], durable: bool = False):
+        """
+        Write a batch of serialized files in one pass.
+        
+        Every payload goes to a temp file first and the renames follow
+        back to back, so related files (session + index) land together.
+        With durable set, all data is synced after the writes and each
+        directory once after the renames, rather than write/sync per file.
+        
+        Writers are serialized, and a snapshot older than the one already
+        written to its path is dropped, so a late batch can't roll a file back.
+        """
+        with self._write_lock:
+            files = [f for f in files if f.seq > self._written_seq.get(f.path, 0)]
+            if files:
+                self._write_batch(files, durable)
+                for path, _, seq in files:
+                    self._written_seq[path] = seq
+    
+    def _write_batch(self, files: List[_Snapshot], durable: bool):
+        staged = []
         try:
-            with open(index_path, 'w') as f:
-                json.dump(self.index, f, indent=2)
-        except Exception as e:
-            self.logger.error(f"Error saving session index: {e}")
+            for path, payload, _ in files:
+                staged.append(self._stage_file(path, payload))
+            if durable:
+                for temp_file in staged:
+                    self._sync_path(temp_file, os.O_RDWR)
+            for temp_file, (path, _, _) in zip(staged, files):
+                dir_fd = self._dir_fds.get(path.parent)
+                if dir_fd is None:
+                    os.replace(temp_file, path)
+                else:
+                    os.replace(temp_file.name, path.name, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+            if durable and os.name != "nt":
+                for directory in {f.path.parent for f in files}:
+                    dir_fd = self._dir_fds.get(directory)
+                    if dir_fd is None:
+                        self._sync_path(directory, os.O_RDONLY)
+                    else:
+                        os.fsync(dir_fd)
+        except Exception:
+            for temp_file in staged:
+                try:
+                    os.unlink(temp_file)
+                except FileNotFoundError:
+                    pass
+            raise
+    
+    @staticmethod
+    def _sync_path(path: Path, flags: int):
+        """Flush a file's data (or a directory entry) to disk"""
+        fd = os.open(path, flags)
+        try:
+            getattr(os, "fdatasync", os.fsync)(fd)
+        finally:
+            os.close(fd)
+    
+    def _stage_file(self, path: Path, payload: bytes) -> Path:
+        """
+        Write payload next to path and return the temp file holding it.
+        
+        On Linux the data goes into an unnamed O_TMPFILE inode that only gets
+        a name (via linkat) once fully written, so a crash never leaves a
+        half-written temp file behind. Elsewhere a NamedTemporaryFile is used.
+        """
+        dir_fd = self._dir_fds.get(path.parent)
+        if self._tmpfile_supported:
+            try:
+                if dir_fd is None:
+                    fd = os.open(path.parent, self._O_TMPFILE | os.O_WRONLY, 0o600)
+                else:
+                    fd = os.open(".", self._O_TMPFILE | os.O_WRONLY, 0o600, dir_fd=dir_fd)
+            except OSError:
+                self._tmpfile_supported = False
+            else:
+                try:
+                    view = memoryview(payload)
+                    while view:
+                        view = view[os.write(fd, view):]
+                    temp_file = path.parent / f".{path.name}.{uuid.uuid4().hex[:8]}.tmp"
+                    if dir_fd is None:
+                        os.link(f"/proc/self/fd/{fd}", temp_file)
+                    else:
+                        os.link(f"/proc/self/fd/{fd}", temp_file.name, dst_dir_fd=dir_fd)
+                    return temp_file
+                except OSError as e:
+                    self.logger.debug("O_TMPFILE write failed, falling back: %s", e)
+                    self._tmpfile_supported = False
+                finally:
+                    os.close(fd)
+        
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent,
+            prefix=f".{path.name}.",
+            suffix=".tmp",
+            delete=False
+        ) as f:
+            f.write(payload)
+        return Path(f.name)
+    
+    def _unlink_in(self, directory: Path, name: str):
+        """Remove name from directory, relative to its held descriptor when there is one"""
+        dir_fd = self._dir_fds.get(directory)
+        if dir_fd is None:
+            os.unlink(os.path.join(directory, name))
+        else:
+            os.unlink(name, dir_fd=dir_fd)
     
-    def _generate_session_id(self) -> str:
+    def _lookup_dirs(self, session_id: str, directories: List[Path]) -> List[Path]:
+        """Order directories so the one matching the indexed status comes first"""
+        status = self.index["sessions"].get(session_id, {}).get("status")
+        member = _STATUS_BY_VALUE.get(status)
+        if member is None:
+            return directories
+        known = self._status_dirs.get(member, self.paused_dir)
+        return [known] + [d for d in directories if d != known]
+    
+    def _generate_session_id(self, now: Optional[datetime] = None) -> str:
         """Generate unique session ID"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = (now or datetime.now()).strftime("%Y%m%d_%H%M%S")
         unique_id = uuid.uuid4().hex[:6]
         return f"session_{timestamp}_{unique_id}"
     
@@ -117,10 +423,13 @@ class SessionManager:
         Returns:
             Session ID
         """
-        session_id = self._generate_session_id()
+        # One clock read stamps the ID, default name, file and index
+        now = datetime.now()
+        now_iso = now.isoformat()
+        session_id = self._generate_session_id(now)
         
         if not name:
-            name = f"Session {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+            name = f"Session {now.strftime('%Y-%m-%d %H:%M')}"
         
         # Create session data structure
         session_data = {
@@ -128,8 +437,8 @@ class SessionManager:
             "session": {
                 "id": session_id,
                 "name": name,
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
+                "created_at": now_iso,
+                "updated_at": now_iso,
                 "status": SessionStatus.ACTIVE.value,
                 "mode": mode,
                 "description": description
@@ -189,7 +498,7 @@ class SessionManager:
         (session_dir / "artifacts").mkdir(exist_ok=True)
         
         # Save session file
-        self._save_session_file(session_id, session_data, SessionStatus.ACTIVE)
+        self._save_session_file(session_id, session_data, SessionStatus.ACTIVE, now)
         
         # Update index
         self.index["sessions"][session_id] = {
@@ -197,6 +506,7 @@ class SessionManager:
             "status": SessionStatus.ACTIVE.value,
             "mode": mode,
             "created_at": session_data["session"]["created_at"],
+            "created_date": session_data["session"]["created_at"][:10],
             "updated_at": session_data["session"]["updated_at"]
         }
         self.index["last_active"] = session_id
@@ -205,48 +515,112 @@ class SessionManager:
         # Set as current session
         self.current_session_id = session_id
         self.current_session_data = session_data
+        self._revision += 1
         
         self.logger.info(f"Created session: {session_id} ({name})")
         return session_id
     
-    def _save_session_file(self, session_id: str, session_data: Dict, status: SessionStatus):
-        """Save session to .nrs file"""
+    def _session_payload(
+        self,
+        session_id: str,
+        session_data: Dict,
+        status: SessionStatus,
+        now: Optional[datetime] = None,
+        pretty: bool = False
+    ) -> _Snapshot:
+        """Stamp session data with its status and serialize it for its .nrs file"""
         # Determine directory based on status
-        if status == SessionStatus.ACTIVE:
-            target_dir = self.active_dir
-        elif status == SessionStatus.PAUSED:
-            target_dir = self.paused_dir
-        elif status == SessionStatus.COMPLETED:
-            target_dir = self.completed_dir
-        else:
-            target_dir = self.paused_dir
-        
-        session_file = target_dir / f"{session_id}.nrs"
+        target_dir = self._status_dirs.get(status, self.paused_dir)
+        session_file = target_dir / (session_id + ".nrs")
         
         # Update status in data
-        session_data["session"]["status"] = status.value
-        session_data["session"]["updated_at"] = datetime.now().isoformat()
+        session = session_data["session"]
+        session["status"] = status.value
+        session["updated_at"] = (now or datetime.now()).isoformat()
         
-        # Atomic write (write to temp, then rename)
-        temp_file = session_file.with_suffix('.nrs.tmp')
+        return self._snapshot(session_file, _dumps(session_data, pretty))
+    
+    def _save_session_file(
+        self,
+        session_id: str,
+        session_data: Dict,
+        status: SessionStatus,
+        now: Optional[datetime] = None,
+        pretty: bool = False
+    ):
+        """Save session to .nrs file (indented only when pretty is set)"""
+        snapshot = self._session_payload(session_id, session_data, status, now, pretty)
+        session_file = snapshot.path
+        
+        # Atomic, durable write (write and sync temp, then replace)
         try:
-            with open(temp_file, 'w') as f:
-                json.dump(session_data, f, indent=2)
-            temp_file.rename(session_file)
-            self.logger.debug(f"Saved session file: {session_file}")
+            self._write_files([snapshot], durable=True)
+            self.logger.debug("Saved session file: %s", session_file)
         except Exception as e:
             self.logger.error(f"Error saving session file: {e}")
-            if temp_file.exists():
-                temp_file.unlink()
             raise
     
-    def save_session(self, session_id: Optional[str] = None, notes: str = ""):
+    def save_session(
+        self,
+        session_id: Optional[str] = None,
+        notes: str = "",
+        now: Optional[datetime] = None,
+        wait: bool = True
+    ) -> Optional[Future]:
         """
         Save current or specified session.
         
         Args:
             session_id: Session ID (uses current if None)
             notes: Optional notes to add to metadata
+            now: Save timestamp (defaults to datetime.now())
+            wait: If False, serialize here but write on the background I/O
+                thread, returning its Future (None if there was nothing to save)
+        """
+        # Nothing changed since the last save and its file is still there: skip the write
+        if (
+            not notes
+            and session_id in (None, self.current_session_id)
+            and self._revision == self._saved_revision
+            and os.path.exists(os.path.join(self.paused_dir, f"{self.current_session_id}.nrs"))
+        ):
+            self.logger.debug("Session unchanged, skipping save: %s", self.current_session_id)
+            return None
+        
+        # Session and index are snapshotted on the caller's thread, which owns
+        # them; only the disk I/O may be handed off
+        session_id, files = self.prepare_save(session_id, notes, now)
+        revision = self._revision
+        if not wait:
+            if self._io_exec is None:
+                self._io_exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nrs-io")
+            return self._io_exec.submit(self._finish_save, session_id, files, revision)
+        
+        self._finish_save(session_id, files, revision)
+        return None
+    
+    def _finish_save(self, session_id: str, files: List[_Snapshot], revision: int):
+        """Durably write a prepared save and remember the revision it captured"""
+        self.write_save(session_id, files, durable=True)
+        if session_id == self.current_session_id:
+            self._saved_revision = revision
+    
+    def prepare_save(
+        self,
+        session_id: Optional[str] = None,
+        notes: str = "",
+        now: Optional[datetime] = None
+    ) -> Tuple[str, List[_Snapshot]]:
+        """
+        Serialize a save without touching disk.
+        
+        Args:
+            session_id: Session ID (uses current if None)
+            notes: Optional notes to add to metadata
+            now: Save timestamp (defaults to datetime.now())
+            
+        Returns:
+            Session ID and the batch of file snapshots for write_save()
         """
         if not session_id:
             session_id = self.current_session_id
@@ -260,29 +634,58 @@ class SessionManager:
         # Update metadata
         if notes:
             self.current_session_data["metadata"]["notes"] = notes
+            self._revision += 1
         
-        # Save to paused directory
-        self._save_session_file(
-            session_id,
-            self.current_session_data,
-            SessionStatus.PAUSED
-        )
+        # One timestamp for the session record and its index entry
+        if now is None:
+            now = datetime.now()
         
         # Update index
         self.index["sessions"][session_id]["status"] = SessionStatus.PAUSED.value
-        self.index["sessions"][session_id]["updated_at"] = datetime.now().isoformat()
-        self._save_index()
+        self.index["sessions"][session_id]["updated_at"] = now.isoformat()
+        
+        # Session file (paused directory) and index go out as one batch
+        return session_id, [
+            self._session_payload(
+                session_id,
+                self.current_session_data,
+                SessionStatus.PAUSED,
+                now
+            ),
+            self._index_payload()
+        ]
+    
+    def write_save(
+        self,
+        session_id: str,
+        files: List[_Snapshot],
+        durable: bool = False
+    ):
+        """
+        Persist a batch produced by prepare_save().
+        
+        Args:
+            session_id: Session ID the batch belongs to
+            files: File snapshots to write
+            durable: Sync the batch to disk before returning (shutdown saves)
+        """
+        try:
+            self._write_files(files, durable=durable)
+        except Exception as e:
+            self.logger.error(f"Error saving session file: {e}")
+            raise
         
         # Remove from active directory if exists
-        active_file = self.active_dir / f"{session_id}.nrs"
-        if active_file.exists():
-            active_file.unlink()
+        try:
+            self._unlink_in(self.active_dir, f"{session_id}.nrs")
+        except FileNotFoundError:
+            pass
         
-        self.logger.info(f"Saved session: {session_id}")
+        self.logger.info("Saved session: %s", session_id)
     
     def load_session(self, session_id: str) -> Dict:
         """
-        Load a session from file.
+        Load a session from file and make it the current session.
         
         Args:
             session_id: Session ID to load
@@ -290,30 +693,75 @@ class SessionManager:
         Returns:
             Session data dictionary
         """
-        # Search for session file in all directories
-        for directory in [self.active_dir, self.paused_dir, self.completed_dir]:
-            session_file = directory / f"{session_id}.nrs"
-            if session_file.exists():
-                try:
-                    with open(session_file, 'r') as f:
-                        session_data = json.load(f)
-                    
-                    # Validate version
-                    if session_data.get("nrs_version") != self.NRS_VERSION:
-                        self.logger.warning(
-                            f"Session version mismatch: {session_data.get('nrs_version')} != {self.NRS_VERSION}"
-                        )
-                        # TODO: Implement migration
-                    
-                    self.current_session_id = session_id
-                    self.current_session_data = session_data
-                    
-                    self.logger.info(f"Loaded session: {session_id}")
-                    return session_data
-                    
-                except Exception as e:
-                    self.logger.error(f"Error loading session {session_id}: {e}")
-                    raise
+        session_data = self.load_session_body(session_id)
+        
+        self.current_session_id = session_id
+        self.current_session_data = session_data
+        self._revision += 1
+        
+        self.logger.info(f"Loaded session: {session_id}")
+        return session_data
+    
+    def load_session_meta(self, session_id: str) -> Dict:
+        """
+        Get a session's index metadata without touching its file.
+        
+        Args:
+            session_id: Session ID
+            
+        Returns:
+            Index entry (name, status, mode, timestamps) plus the ID
+        """
+        metadata = self.index["sessions"].get(session_id)
+        if metadata is None:
+            raise FileNotFoundError(f"Session not found: {session_id}")
+        return {"id": session_id, **metadata}
+    
+    def get_session(self, session_id: str) -> LazySession:
+        """
+        Get a lazily loaded view of a session, for previews.
+        
+        Unlike load_session(), this does not change the current session.
+        """
+        self.load_session_meta(session_id)
+        return LazySession(self, session_id)
+    
+    def load_session_body(self, session_id: str) -> Dict:
+        """
+        Read and parse a session's .nrs file.
+        
+        Args:
+            session_id: Session ID to read
+            
+        Returns:
+            Session data dictionary
+        """
+        # Directory recorded in the index first, then the rest
+        for directory in self._lookup_dirs(
+            session_id,
+            [self.active_dir, self.paused_dir, self.completed_dir]
+        ):
+            try:
+                with open(os.path.join(directory, f"{session_id}.nrs"), 'rb') as f:
+                    raw = f.read()
+            except FileNotFoundError:
+                continue
+            
+            try:
+                session_data = _loads(raw)
+                
+                # Validate version
+                if session_data.get("nrs_version") != self.NRS_VERSION:
+                    self.logger.warning(
+                        f"Session version mismatch: {session_data.get('nrs_version')} != {self.NRS_VERSION}"
+                    )
+                    # TODO: Implement migration
+                
+                return session_data
+                
+            except Exception as e:
+                self.logger.error(f"Error loading session {session_id}: {e}")
+                raise
         
         raise FileNotFoundError(f"Session not found: {session_id}")
     
@@ -337,17 +785,21 @@ class SessionManager:
         session_data = self.load_session(session_id)
         
         # Move to active directory
-        self._save_session_file(session_id, session_data, SessionStatus.ACTIVE)
+        now = datetime.now()
+        self._save_session_file(session_id, session_data, SessionStatus.ACTIVE, now)
         
         # Remove from paused directory
-        paused_file = self.paused_dir / f"{session_id}.nrs"
-        if paused_file.exists():
-            paused_file.unlink()
+        try:
+            self._unlink_in(self.paused_dir, f"{session_id}.nrs")
+        except FileNotFoundError:
+            pass
         
         # Update index
         self.index["sessions"][session_id]["status"] = SessionStatus.ACTIVE.value
+        self.index["sessions"][session_id]["updated_at"] = now.isoformat()
         self.index["last_active"] = session_id
         self._save_index()
+        self.flush()
         
         self.logger.info(f"Resumed session: {session_id}")
         return session_data
@@ -355,7 +807,8 @@ class SessionManager:
     def list_sessions(
         self,
         status: Optional[str] = None,
-        mode: Optional[str] = None
+        mode: Optional[str] = None,
+        limit: Optional[int] = None
     ) -> List[Dict]:
         """
         List all sessions with optional filtering.
@@ -363,30 +816,34 @@ class SessionManager:
         Args:
             status: Filter by status (active/paused/completed)
             mode: Filter by mode (offensive/defensive)
+            limit: Only return the N most recently updated sessions
             
         Returns:
-            List of session metadata
+            List of session metadata (including a YYYY-MM-DD created_date)
         """
-        sessions = []
-        
-        for session_id, metadata in self.index["sessions"].items():
-            # Apply filters
-            if status and metadata.get("status") != status:
-                continue
-            if mode and metadata.get("mode") != mode:
-                continue
-            
-            sessions.append({
-                "id": session_id,
-                **metadata
-            })
-        
-        # Sort by updated_at (most recent first)
-        sessions.sort(key=lambda x: x.get("updated_at", ""), reverse=True)
+        # Sort on (updated_at, id, metadata) keys and only build the
+        # returned dicts for the entries that survive the cut
+        entries = [
+            (metadata.get("updated_at", ""), session_id, metadata)
+            for session_id, metadata in self.index["sessions"].items()
+            if (not status or metadata.get("status") == status)
+            and (not mode or metadata.get("mode") == mode)
+        ]
+        
+        # Most recent first
+        sort_key = itemgetter(0)
+        if limit is not None:
+            entries = heapq.nlargest(limit, entries, key=sort_key)
+        else:
+            entries.sort(key=sort_key, reverse=True)
         
-        return sessions
+        return [{"id": session_id, **metadata} for _, session_id, metadata in entries]
     
-    def delete_session(self, session_id: str, force: bool = False):
+    def delete_session(
+        self,
+        session_id: str,
+        force: bool = False
+    ):
         """
         Delete a session.
         
@@ -398,17 +855,20 @@ class SessionManager:
             # In CLI, this would prompt for confirmation
             self.logger.warning(f"Deleting session: {session_id}")
         
-        # Remove session file from all directories
+        # Remove the session file from every status directory, so no stray copy
+        # (e.g. left behind by a resume or status change) can bring it back
         for directory in [self.active_dir, self.paused_dir, self.completed_dir, self.archived_dir]:
-            session_file = directory / f"{session_id}.nrs"
-            if session_file.exists():
-                session_file.unlink()
+            try:
+                self._unlink_in(directory, f"{session_id}.nrs")
+            except FileNotFoundError:
+                pass
         
         # Remove session data directory
-        session_dir = self.session_data_dir / session_id
-        if session_dir.exists():
-            import shutil
-            shutil.rmtree(session_dir)
+        import shutil
+        try:
+            shutil.rmtree(os.path.join(self._session_data_dir_str, session_id))
+        except FileNotFoundError:
+            pass
         
         # Remove from index
         if session_id in self.index["sessions"]:
@@ -433,24 +893,35 @@ class SessionManager:
         session_data = self.load_session(session_id)
         
         # Update name
+        now = datetime.now()
         session_data["session"]["name"] = new_name
-        session_data["session"]["updated_at"] = datetime.now().isoformat()
         
         # Save
-        status = SessionStatus(session_data["session"]["status"])
-        self._save_session_file(session_id, session_data, status)
+        status = _STATUS_BY_VALUE[session_data["session"]["status"]]
+        self._save_session_file(session_id, session_data, status, now)
         
         # Update index
         self.index["sessions"][session_id]["name"] = new_name
-        self.index["sessions"][session_id]["updated_at"] = datetime.now().isoformat()
+        self.index["sessions"][session_id]["updated_at"] = now.isoformat()
         self._save_index()
         
         self.logger.info(f"Renamed session {session_id} to: {new_name}")
     
     def get_current_session(self) -> Optional[Dict]:
-        """Get current active session data"""
+        """
+        Get current active session data.
+        
+        Treat the returned dict as read-only: change state through
+        update_session_state(), which bumps revision. Auto-save only writes
+        when revision has moved, so edits made in place are not saved.
+        """
         return self.current_session_data
     
+    @property
+    def revision(self) -> int:
+        """Counter bumped by every change to the current session (load, create, update)"""
+        return self._revision
+    
     def update_session_state(self, updates: Dict):
         """
         Update current session state.
@@ -466,14 +937,22 @@ class SessionManager:
         
         # Update timestamp
         self.current_session_data["session"]["updated_at"] = datetime.now().isoformat()
+        self._revision += 1
     
     def _deep_merge(self, base: Dict, updates: Dict):
-        """Deep merge updates into base dictionary"""
-        for key, value in updates.items():
-            if key in base and isinstance(base[key], dict) and isinstance(value, dict):
-                self._deep_merge(base[key], value)
-            else:
-                base[key] = value
+        """Deep merge updates into base dictionary (iterative, no recursion)"""
+        stack = [(base, updates)]
+        push = stack.append
+        pop = stack.pop
+        while stack:
+            target, changes = pop()
+            get = target.get
+            for key, value in changes.items():
+                current = get(key)
+                if type(value) is dict and type(current) is dict:
+                    push((current, value))
+                else:
+                    target[key] = value
 
 
 # Example usage
@@ -6,13 +6,37 @@ Handles serialization/deserialization of session state to .nrs format.
 Designed and developed by demonking369
 """
 
+import os
 import json
 import gzip
+import heapq
+import contextlib
+from collections import deque
 import logging
 from pathlib import Path
 from typing import Dict, Any, Optional
 from datetime import datetime
 
+# orjson works on bytes in both directions, skipping the separate UTF-8
+# encode/decode pass; fall back to the stdlib.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Top-level sections and session fields every .nrs document must carry
+_REQUIRED_FIELDS = frozenset([
+    "nrs_version",
+    "session",
+    "conversation",
+    "task_state",
+    "tools_state",
+    "mode_state",
+    "results",
+    "metadata"
+])
+_REQUIRED_SESSION_FIELDS = frozenset(["id", "name", "created_at", "status", "mode"])
+
 
 class SessionSerializer:
     """
@@ -28,13 +52,25 @@ class SessionSerializer:
     SUPPORTED_VERSIONS = ["1.0"]
     CURRENT_VERSION = "1.0"
     
+    # gzip level for compressed sessions; 1 is several times faster than 9
+    # for a small size cost
+    COMPRESS_LEVEL = 1
+    GZIP_MAGIC = b"\x1f\x8b"
+    
+    # Checkpoints kept per directory
+    MAX_CHECKPOINTS = 10
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        
+        # Oldest-first ring of checkpoint names per directory
+        self._checkpoints: Dict[Path, deque] = {}
     
     def serialize(
         self,
         session_data: Dict,
-        compress: bool = False
+        compress: bool = False,
+        pretty: bool = False
     ) -> bytes:
         """
         Serialize session data to bytes.
@@ -42,6 +78,7 @@ class SessionSerializer:
         Args:
             session_data: Session data dictionary
             compress: Enable gzip compression
+            pretty: Indent the JSON for human reading
             
         Returns:
             Serialized bytes
@@ -51,12 +88,23 @@ class SessionSerializer:
             self._validate_schema(session_data)
             
             # Convert to JSON
-            json_str = json.dumps(session_data, indent=2, ensure_ascii=False)
-            json_bytes = json_str.encode('utf-8')
+            if orjson is not None:
+                option = orjson.OPT_NON_STR_KEYS
+                if pretty:
+                    option |= orjson.OPT_INDENT_2
+                json_bytes = orjson.dumps(session_data, option=option)
+            else:
+                json_str = json.dumps(
+                    session_data,
+                    indent=2 if pretty else None,
+                    separators=None if pretty else (",", ":"),
+                    ensure_ascii=False
+                )
+                json_bytes = json_str.encode('utf-8')
             
             # Compress if requested
             if compress:
-                json_bytes = gzip.compress(json_bytes)
+                json_bytes = gzip.compress(json_bytes, compresslevel=self.COMPRESS_LEVEL)
                 self.logger.debug("Session data compressed")
             
             return json_bytes
@@ -68,7 +116,8 @@ class SessionSerializer:
     def deserialize(
         self,
         data: bytes,
-        decompress: bool = False
+        decompress: bool = False,
+        trusted: bool = False
     ) -> Dict:
         """
         Deserialize session data from bytes.
@@ -76,6 +125,7 @@ class SessionSerializer:
         Args:
             data: Serialized bytes
             decompress: Enable gzip decompression
+            trusted: Skip schema validation (data written by this serializer)
             
         Returns:
             Session data dictionary
@@ -87,11 +137,14 @@ class SessionSerializer:
                 self.logger.debug("Session data decompressed")
             
             # Parse JSON
-            json_str = data.decode('utf-8')
-            session_data = json.loads(json_str)
+            if orjson is not None:
+                session_data = orjson.loads(data)
+            else:
+                session_data = json.loads(data.decode('utf-8'))
             
             # Validate schema
-            self._validate_schema(session_data)
+            if not trusted:
+                self._validate_schema(session_data)
             
             # Check version compatibility
             version = session_data.get("nrs_version")
@@ -120,37 +173,68 @@ class SessionSerializer:
             file_path: Path to .nrs file
             compress: Enable compression
         """
+        temp_path = file_path.with_suffix('.nrs.tmp')
         try:
-            # Serialize
-            data = self.serialize(session_data, compress=compress)
-            
-            # Atomic write
-            temp_path = file_path.with_suffix('.nrs.tmp')
-            with open(temp_path, 'wb') as f:
-                f.write(data)
-            
-            # Rename to final path
-            temp_path.rename(file_path)
+            # Serialize (compression is streamed into the file below)
+            data = self.serialize(session_data)
+            
+            # Atomic, durable write: data is synced before the rename
+            fd = os.open(
+                temp_path,
+                os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0),
+                0o600
+            )
+            if compress:
+                with open(fd, 'wb') as raw:
+                    with gzip.GzipFile(
+                        fileobj=raw,
+                        mode='wb',
+                        compresslevel=self.COMPRESS_LEVEL
+                    ) as gz:
+                        gz.write(data)
+                    raw.flush()
+                    os.fsync(raw.fileno())
+            else:
+                # Plain payload goes straight to the fd, no buffered-writer copy
+                try:
+                    view = memoryview(data)
+                    while view:
+                        view = view[os.write(fd, view):]
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            
+            # Replace final path (also overwrites on Windows)
+            os.replace(temp_path, file_path)
+            if os.name != "nt":
+                dir_fd = os.open(file_path.parent, os.O_RDONLY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
             
             self.logger.info(f"Session saved to: {file_path}")
             
         except Exception as e:
             self.logger.error(f"Error saving session file: {e}")
-            if temp_path.exists():
-                temp_path.unlink()
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(temp_path)
             raise
     
     def load_from_file(
         self,
         file_path: Path,
-        decompress: bool = False
+        decompress: bool = False,
+        trusted: bool = False
     ) -> Dict:
         """
         Load session data from .nrs file.
         
         Args:
             file_path: Path to .nrs file
-            decompress: Enable decompression
+            decompress: Enable decompression (gzip files are also detected
+                by their magic bytes, so plain and compressed both load)
+            trusted: Skip schema validation (files this serializer wrote)
             
         Returns:
             Session data dictionary
@@ -159,7 +243,11 @@ class SessionSerializer:
             with open(file_path, 'rb') as f:
                 data = f.read()
             
-            session_data = self.deserialize(data, decompress=decompress)
+            session_data = self.deserialize(
+                data,
+                decompress=data[:2] == self.GZIP_MAGIC,
+                trusted=trusted
+            )
             
             self.logger.info(f"Session loaded from: {file_path}")
             return session_data
@@ -178,26 +266,15 @@ class SessionSerializer:
         Raises:
             ValueError: If schema is invalid
         """
-        required_fields = [
-            "nrs_version",
-            "session",
-            "conversation",
-            "task_state",
-            "tools_state",
-            "mode_state",
-            "results",
-            "metadata"
-        ]
-        
-        for field in required_fields:
-            if field not in session_data:
-                raise ValueError(f"Missing required field: {field}")
+        # difference() against the dict itself probes it directly, no key-set copy
+        missing = _REQUIRED_FIELDS.difference(session_data)
+        if missing:
+            raise ValueError(f"Missing required field: {', '.join(sorted(missing))}")
         
         # Validate session section
-        session_required = ["id", "name", "created_at", "status", "mode"]
-        for field in session_required:
-            if field not in session_data["session"]:
-                raise ValueError(f"Missing session field: {field}")
+        missing = _REQUIRED_SESSION_FIELDS.difference(session_data["session"])
+        if missing:
+            raise ValueError(f"Missing session field: {', '.join(sorted(missing))}")
         
         self.logger.debug("Schema validation passed")
     
@@ -269,12 +346,14 @@ class SessionSerializer:
         """
         try:
             # Find .nrs file
-            nrs_files = list(import_path.glob("*.nrs"))
-            if not nrs_files:
+            with os.scandir(import_path) as entries:
+                session_file = next(
+                    (entry.path for entry in entries if entry.name.endswith(".nrs")),
+                    None
+                )
+            if session_file is None:
                 raise FileNotFoundError("No .nrs file found in import path")
             
-            session_file = nrs_files[0]
-            
             # Load session
             session_data = self.load_from_file(session_file, decompress=True)
             session_id = session_data["session"]["id"]
@@ -308,19 +387,43 @@ class SessionSerializer:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             checkpoint_file = checkpoint_dir / f"checkpoint_{timestamp}.nrs"
             
+            ring = self._checkpoint_ring(checkpoint_dir)
             self.save_to_file(session_data, checkpoint_file, compress=True)
             
-            # Keep only last 10 checkpoints
-            checkpoints = sorted(checkpoint_dir.glob("checkpoint_*.nrs"))
-            if len(checkpoints) > 10:
-                for old_checkpoint in checkpoints[:-10]:
-                    old_checkpoint.unlink()
+            # Keep only the last MAX_CHECKPOINTS; a same-second checkpoint
+            # overwrote its file, so it is already in the ring
+            if not ring or ring[-1] != checkpoint_file.name:
+                if len(ring) == ring.maxlen:
+                    with contextlib.suppress(FileNotFoundError):
+                        os.unlink(checkpoint_dir / ring[0])
+                ring.append(checkpoint_file.name)
             
             self.logger.debug(f"Checkpoint created: {checkpoint_file}")
             
         except Exception as e:
             self.logger.error(f"Checkpoint error: {e}")
     
+    def _checkpoint_ring(self, checkpoint_dir: Path) -> deque:
+        """
+        Get the checkpoint ring for a directory, seeding it with one scan
+        (and pruning anything beyond MAX_CHECKPOINTS) on first use.
+        """
+        ring = self._checkpoints.get(checkpoint_dir)
+        if ring is None:
+            with os.scandir(checkpoint_dir) as entries:
+                names = [
+                    entry.name for entry in entries
+                    if entry.name.startswith("checkpoint_") and entry.name.endswith(".nrs")
+                ]
+            newest = heapq.nlargest(self.MAX_CHECKPOINTS, names)
+            for stale in set(names).difference(newest):
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(checkpoint_dir / stale)
+            ring = self._checkpoints[checkpoint_dir] = deque(
+                reversed(newest), maxlen=self.MAX_CHECKPOINTS
+            )
+        return ring
+    
     def restore_from_checkpoint(
         self,
         checkpoint_dir: Path,
@@ -337,12 +440,16 @@ class SessionSerializer:
             Restored session data
         """
         try:
-            checkpoints = sorted(checkpoint_dir.glob("checkpoint_*.nrs"))
+            with os.scandir(checkpoint_dir) as entries:
+                checkpoints = sorted(
+                    entry.name for entry in entries
+                    if entry.name.startswith("checkpoint_") and entry.name.endswith(".nrs")
+                )
             if not checkpoints:
                 raise FileNotFoundError("No checkpoints found")
             
-            checkpoint_file = checkpoints[checkpoint_index]
-            session_data = self.load_from_file(checkpoint_file, decompress=True)
+            checkpoint_file = checkpoint_dir / checkpoints[checkpoint_index]
+            session_data = self.load_from_file(checkpoint_file, decompress=True, trusted=True)
             
             self.logger.info(f"Restored from checkpoint: {checkpoint_file}")
             return session_data
@@ -47,6 +47,15 @@ class BaseTool(ABC):
     def parse_output(self, raw_output: str) -> Dict[str, Any]:
         """Parse raw terminal output into structured JSON."""
         pass
+
+    def parse_output_file(self, path: Path, tail: str) -> Dict[str, Any]:
+        """
+        Parse output too large to keep in memory; path holds all of it and
+        tail the last part that was kept. Only the tail is parsed here, so
+        memory stays bounded; wrappers whose format can be read
+        incrementally override this to parse the whole file.
+        """
+        return self.parse_output(tail)
     
     @abstractmethod
     def check_installed(self) -> bool:
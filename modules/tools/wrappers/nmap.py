@@ -1,8 +1,49 @@
 import shutil
-import xml.etree.ElementTree as ET
-from typing import Dict, Any, List
+import xml.sax
+from pathlib import Path
+from typing import Dict, Any, List, Optional
 from modules.tools.base import BaseTool, ToolCategory, ToolMode, ToolInput
 
+# SECURITY: nmap XML carries attacker-influenced banners; parse it with defusedxml
+try:
+    from defusedxml.sax import parse as _parse_xml, parseString as _parse_xml_string
+except ImportError:
+    _parse_xml, _parse_xml_string = xml.sax.parse, xml.sax.parseString
+
+
+class _NmapXMLHandler(xml.sax.ContentHandler):
+    """Builds host/port dicts straight from SAX events, so no element tree is allocated"""
+
+    def __init__(self):
+        super().__init__()
+        self.hosts: List[Dict[str, Any]] = []
+        self._host: Optional[Dict[str, Any]] = None
+        self._port: Optional[Dict[str, Any]] = None
+
+    def startElement(self, name, attrs):
+        if name == "host":
+            self._host = {"ip": None, "ports": []}
+        elif self._host is None:
+            return
+        elif name == "address" and self._host["ip"] is None:
+            self._host["ip"] = attrs.get("addr")
+        elif name == "port":
+            self._port = {"port": attrs.get("portid"), "state": None, "service": "unknown"}
+        elif self._port is not None:
+            if name == "state":
+                self._port["state"] = attrs.get("state")
+            elif name == "service":
+                self._port["service"] = attrs.get("name")
+
+    def endElement(self, name):
+        if name == "port" and self._port is not None:
+            self._host["ports"].append(self._port)
+            self._port = None
+        elif name == "host" and self._host is not None:
+            self.hosts.append(self._host)
+            self._host = None
+
+
 class NmapTool(BaseTool):
     def __init__(self):
         super().__init__(
@@ -30,29 +71,23 @@ class NmapTool(BaseTool):
         return cmd
 
     def parse_output(self, raw_output: str) -> Dict[str, Any]:
-        # Parse XML output from stdout
+        # Parse XML output from stdout; SAX keeps memory flat on large scans
+        handler = _NmapXMLHandler()
         try:
-            root = ET.fromstring(raw_output)
-            hosts = []
-            for host in root.findall("host"):
-                address = host.find("address").get("addr")
-                ports = []
-                ports_elem = host.find("ports")
-                if ports_elem:
-                    for port in ports_elem.findall("port"):
-                        port_id = port.get("portid")
-                        state = port.find("state").get("state")
-                        service = port.find("service")
-                        service_name = service.get("name") if service is not None else "unknown"
-                        ports.append({
-                            "port": port_id,
-                            "state": state,
-                            "service": service_name
-                        })
-                hosts.append({"ip": address, "ports": ports})
-            return {"hosts": hosts}
-        except ET.ParseError:
+            _parse_xml_string(raw_output.encode("utf-8"), handler)
+            return {"hosts": handler.hosts}
+        except (xml.sax.SAXParseException, ValueError):
+            # defusedxml's forbidden-construct errors are ValueErrors
             return {"error": "Failed to parse Nmap XML", "raw": raw_output[:500]}
 
+    def parse_output_file(self, path: Path, tail: str) -> Dict[str, Any]:
+        # SAX reads the spilled file in chunks, so a huge scan is never held whole
+        handler = _NmapXMLHandler()
+        try:
+            _parse_xml(str(path), handler)
+            return {"hosts": handler.hosts}
+        except (xml.sax.SAXParseException, ValueError):
+            return {"error": "Failed to parse Nmap XML", "raw": tail[-500:]}
+
     def check_installed(self) -> bool:
         return shutil.which("nmap") is not None
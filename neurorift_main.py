@@ -51,7 +51,7 @@ from modules.exploit.exploit_module import ExploitModule
 from modules.scan.scan_module import ScanModule
 from modules.session.session_manager import SessionManager
 from modules.session.autosave_service import AutoSaveService
-from modules.session.session_cli import SessionCLI, setup_session_parser
+from modules.session.session_cli import SessionCLI, DISPATCH as SESSION_DISPATCH, setup_session_parser
 from modules.orchestration.execution_manager import ExecutionManager, ScanRequest, SessionContext
 from modules.ai.agents import NRPlanner, NROperator, NRAnalyst, NRScribe
 from modules.tools.base import ToolMode
@@ -607,24 +607,9 @@ async def _async_main(args):
     # Handle Session commands
     if args.command == "session":
         session_cli = SessionCLI(vf.session_manager)
-        if args.session_command == 'new':
-            session_cli.cmd_new(args)
-        elif args.session_command == 'save':
-            session_cli.cmd_save(args)
-        elif args.session_command == 'list':
-            session_cli.cmd_list(args)
-        elif args.session_command == 'load':
-            session_cli.cmd_load(args)
-        elif args.session_command == 'resume':
-            session_cli.cmd_resume(args)
-        elif args.session_command == 'delete':
-            session_cli.cmd_delete(args)
-        elif args.session_command == 'rename':
-            session_cli.cmd_rename(args)
-        elif args.session_command == 'status':
-            session_cli.cmd_status(args)
-        elif args.session_command == 'export':
-            session_cli.cmd_export(args)
+        handler = SESSION_DISPATCH.get(args.session_command)
+        if handler:
+            handler(session_cli, args)
         return
 
     # Handle automatic session management for other commands
@@ -1082,8 +1067,14 @@ def main():
             print(f"❌ Error launching web interface: {e}")
             return
 
-    # Run the main async pipeline
-    asyncio.run(_async_main(args))
+    # Run the main async pipeline, on uvloop when it is installed: recon is
+    # dominated by subprocess and socket I/O, where libuv's loop is cheaper
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(_async_main(args))
+    else:
+        uvloop.run(_async_main(args))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Test suite for the Robin dark web workflow
+"""
+
+import asyncio
+import importlib.util
+import sys
+import types
+
+import pytest
+
+
+def _stub_missing_llm_deps():
+    """
+    Register minimal stand-ins for the langchain/openai names robin imports
+    when those packages aren't installed; every test fakes the LLM anyway.
+    """
+    stubs = {}
+    if importlib.util.find_spec("openai") is None:
+        stubs["openai"] = {"RateLimitError": type("RateLimitError", (Exception,), {})}
+    if importlib.util.find_spec("langchain_core") is None:
+        stubs.update({
+            "langchain_core": {},
+            "langchain_core.callbacks": {},
+            "langchain_core.callbacks.base": {"BaseCallbackHandler": type("BaseCallbackHandler", (), {})},
+            "langchain_core.globals": {"set_llm_cache": lambda cache: None},
+            "langchain_core.messages": {"SystemMessage": type("SystemMessage", (), {})},
+            "langchain_core.prompts": {"ChatPromptTemplate": type("ChatPromptTemplate", (), {})},
+            "langchain_core.output_parsers": {"StrOutputParser": type("StrOutputParser", (), {})},
+        })
+    for name, attrs in stubs.items():
+        module = types.ModuleType(name)
+        module.__dict__.update(attrs)
+        sys.modules.setdefault(name, module)
+
+
+_stub_missing_llm_deps()
+
+from modules.darkweb.robin import runner
+from modules.darkweb.robin.llm import FILTER_TOP_N
+from modules.darkweb.robin.llm_utils import BufferedStreamingHandler
+
+
+@pytest.fixture
+def search_results():
+    return [
+        {"link": f"http://site{i}.onion/page", "title": f"result {i}"}
+        for i in range(FILTER_TOP_N + 10)
+    ]
+
+
+@pytest.fixture
+def offline_runner(monkeypatch, search_results):
+    """Replace the Tor, search, LLM and scrape calls with local fakes"""
+    scraped_batches = []
+
+    def fake_scrape(urls_data, max_workers=5):
+        scraped_batches.append([res["link"] for res in urls_data])
+        return {res["link"]: res["title"] for res in urls_data}
+
+    monkeypatch.setattr(runner, "_ensure_tor_proxy", lambda: None)
+    monkeypatch.setattr(runner, "preload_model", lambda model: None)
+    monkeypatch.setattr(runner, "configure_llm_cache", lambda: None)
+    monkeypatch.setattr(runner, "get_llm", lambda model: object())
+    monkeypatch.setattr(runner, "refine_query", lambda llm, query: query)
+    monkeypatch.setattr(runner, "get_search_results", lambda query, max_workers: search_results)
+    monkeypatch.setattr(
+        runner, "filter_results",
+        lambda llm, query, results: [results[FILTER_TOP_N + 5], results[0]]
+    )
+    monkeypatch.setattr(runner, "scrape_multiple", fake_scrape)
+    monkeypatch.setattr(
+        runner, "generate_summary",
+        lambda llm, query, content: "\n".join(sorted(content))
+    )
+    return scraped_batches
+
+
+@pytest.mark.asyncio
+async def test_run_darkweb_osint_inside_running_loop(offline_runner, search_results, tmp_path):
+    """The darkweb command is invoked from _async_main, i.e. under a running loop"""
+    asyncio.get_running_loop()
+
+    result = runner.run_darkweb_osint("leaked credentials", output=str(tmp_path))
+
+    assert result["scraped_count"] == 2
+    assert (tmp_path / result["report_path"].rsplit("/", 1)[-1]).exists()
+
+
+def test_speculative_scrape_is_capped_at_filter_size(offline_runner, search_results, tmp_path):
+    """Only results the filter could keep are scraped before it answers"""
+    runner.run_darkweb_osint("leaked credentials", output=str(tmp_path))
+
+    speculative, missing = offline_runner
+    assert speculative == [res["link"] for res in search_results[:FILTER_TOP_N]]
+    assert missing == [search_results[FILTER_TOP_N + 5]["link"]]
+
+
+def test_ollama_model_list_is_cached(monkeypatch):
+    """Model choices don't query Ollama again within the TTL"""
+    from modules.darkweb.robin import llm_utils
+
+    calls = []
+
+    class FakeResponse:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"models": [{"name": "mistral:7b"}]}
+
+    def fake_get(url, timeout):
+        calls.append(url)
+        return FakeResponse()
+
+    monkeypatch.setattr(llm_utils.requests, "get", fake_get)
+    monkeypatch.setattr(llm_utils, "_ollama_models_cache", None)
+
+    first = llm_utils.get_model_choices()
+    assert llm_utils.get_model_choices() == first
+    assert "mistral:7b" in first
+    assert len(calls) == 1
+
+    llm_utils.fetch_ollama_models(refresh=True)
+    assert len(calls) == 2
+
+
+def test_filter_keeps_search_engine_order(monkeypatch):
+    """Results reach the LLM in relevance order, and entries without a link don't break it"""
+    from modules.darkweb.robin import llm
+
+    prompts = []
+
+    class FakeChain:
+        def invoke(self, inputs):
+            prompts.append(inputs["results"])
+            return "1, 2"
+
+    monkeypatch.setattr(llm, "_filter_chain", lambda model: FakeChain())
+    results = [
+        {"link": "http://zzz.onion/", "title": "best match"},
+        {"link": "http://aaa.onion/", "title": "second"},
+        {"title": "no link"},
+    ]
+    monkeypatch.setattr(
+        llm, "_generate_final_string",
+        lambda res, truncate=False: "\n".join(r["title"] for r in res)
+    )
+
+    assert llm.filter_results(object(), "query", results) == results[:2]
+    assert prompts == ["best match\nsecond\nno link"]
+
+
+def test_streaming_handler_flushes_on_size_and_end():
+    """Tokens reach the UI in buffered chunks, and nothing is left behind at the end"""
+    chunks = []
+    handler = BufferedStreamingHandler(buffer_limit=4, ui_callback=chunks.append, flush_interval=3600)
+
+    for token in ("ab", "cd", "e"):
+        handler.on_llm_new_token(token)
+    assert chunks == ["abcd"]
+
+    handler.on_llm_end(None)
+    assert chunks == ["abcd", "e"]
+
+
+def test_write_report_into_directory(tmp_path):
+    """A directory target gets a timestamped report and no temp file is left"""
+    path = runner._write_report("# summary\n", tmp_path)
+
+    assert path.parent == tmp_path
+    assert path.read_text(encoding="utf-8") == "# summary\n"
+    assert [p.name for p in tmp_path.iterdir()] == [path.name]
+
+
+def test_repeated_summary_still_reaches_ui(monkeypatch):
+    """A summary already in the response cache must still be shown"""
+    from modules.darkweb.robin import llm as robin_llm
+
+    cache = {}
+
+    def fake_generate_summary(llm, query, content):
+        # Mimics langchain: a cache hit returns without token callbacks
+        if llm.cache is not False and query in cache:
+            return cache[query]
+        summary = f"summary of {query}"
+        for handler in llm.callbacks:
+            handler.on_llm_new_token(summary)
+            handler.on_llm_end(None)
+        cache[query] = summary
+        return summary
+
+    monkeypatch.setattr(robin_llm, "generate_summary", fake_generate_summary)
+
+    for _ in range(2):
+        shown = []
+        model = types.SimpleNamespace(cache=None, callbacks=[])
+        assert robin_llm.stream_summary(model, "ransomware", {}, shown.append) == "summary of ransomware"
+        assert "".join(shown) == "summary of ransomware"
+
+    # A provider that never streams still gets its answer shown once
+    monkeypatch.setattr(robin_llm, "generate_summary", lambda llm, query, content: "unstreamed")
+    shown = []
+    robin_llm.stream_summary(types.SimpleNamespace(), "q", {}, shown.append)
+    assert shown == ["unstreamed"]
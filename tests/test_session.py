@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Test suite for session persistence
+"""
+
+import atexit
+import json
+import os
+import signal
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from modules.session import session_serializer
+from modules.session.autosave_service import AutoSaveService
+from modules.session.session_manager import SessionManager
+from modules.session.session_serializer import SessionSerializer
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Session manager rooted in a throwaway directory"""
+    manager = SessionManager(str(tmp_path))
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def autosave(manager, monkeypatch):
+    """Stopped auto-save service that leaves the test runner's signal handlers alone"""
+    monkeypatch.setattr(AutoSaveService, "_register_shutdown_handlers", lambda self: None)
+    return AutoSaveService(manager, interval_seconds=3600, enabled=False)
+
+
+class TestSessionState:
+    """Test in-memory session state updates"""
+
+    def test_update_does_not_touch_disk(self, manager, tmp_path):
+        """State updates stay in memory until a save"""
+        session_id = manager.create_session("in-memory")
+        manager.flush()
+        before = sorted(p.name for p in tmp_path.rglob("*") if p.is_file())
+
+        manager.update_session_state({"results": {"hosts": ["10.0.0.1"]}})
+
+        assert sorted(p.name for p in tmp_path.rglob("*") if p.is_file()) == before
+        manager.save_session()
+        assert SessionManager(str(tmp_path)).load_session(session_id)["results"]["hosts"] == ["10.0.0.1"]
+
+    def test_background_save_snapshots_on_caller(self, manager, tmp_path):
+        """save_session(wait=False) serializes before returning; later changes aren't in it"""
+        session_id = manager.create_session("background")
+        manager.update_session_state({"results": {"stage": "recon"}})
+
+        future = manager.save_session(wait=False)
+        manager.update_session_state({"results": {"stage": "exploit"}})
+        future.result(timeout=5)
+
+        assert SessionManager(str(tmp_path)).load_session(session_id)["results"]["stage"] == "recon"
+        assert manager.save_session(wait=False) is not None
+
+
+class TestSessionLifecycle:
+    """Test session files across status directories"""
+
+    def test_delete_removes_stray_copies(self, manager, tmp_path):
+        """A leftover copy in another status directory must not resurrect a deleted session"""
+        session_id = manager.create_session("stray")
+        manager.save_session()
+        stray = manager.completed_dir / f"{session_id}.nrs"
+        stray.write_bytes((manager.paused_dir / f"{session_id}.nrs").read_bytes())
+
+        manager.delete_session(session_id, force=True)
+
+        assert not list(tmp_path.rglob(f"{session_id}.nrs"))
+        with pytest.raises(FileNotFoundError):
+            manager.load_session_body(session_id)
+
+
+class TestAutoSave:
+    """Test the auto-save service"""
+
+    def test_failed_write_is_retried(self, manager, autosave, monkeypatch):
+        """A revision only counts as saved once its write succeeds"""
+        manager.create_session("retry")
+        write_save = manager.write_save
+        calls = []
+
+        def flaky_write_save(*args, **kwargs):
+            calls.append(args[0])
+            if len(calls) == 1:
+                raise OSError("disk full")
+            return write_save(*args, **kwargs)
+
+        monkeypatch.setattr(manager, "write_save", flaky_write_save)
+
+        autosave._perform_auto_save()
+        autosave._perform_auto_save()
+        assert len(calls) == 2
+
+        # Saved now, so an unchanged session is skipped
+        autosave._perform_auto_save()
+        assert len(calls) == 2
+
+    def test_save_now_reports_failure(self, manager, autosave, monkeypatch):
+        """Write errors reach save_now() instead of dying on the writer thread"""
+        manager.create_session("failing")
+        autosave.start()
+        try:
+            def broken_write_save(*args, **kwargs):
+                raise OSError("read-only filesystem")
+
+            monkeypatch.setattr(manager, "write_save", broken_write_save)
+            assert autosave.save_now() is False
+
+            monkeypatch.delattr(manager, "write_save")
+            assert autosave.save_now() is True
+            assert autosave.get_last_save_time() is not None
+        finally:
+            autosave.stop()
+
+
+class TestShutdownSignals:
+    """Test SIGINT/SIGTERM registration for auto-save"""
+
+    @pytest.fixture
+    def restore_signals(self):
+        handlers = {signum: signal.getsignal(signum) for signum in (signal.SIGINT, signal.SIGTERM)}
+        wakeup_fd = signal.set_wakeup_fd(-1)
+        signal.set_wakeup_fd(wakeup_fd)
+        registered = []
+        yield registered
+        for service in registered:
+            atexit.unregister(service._on_exit)
+        for signum, handler in handlers.items():
+            signal.signal(signum, handler)
+        signal.set_wakeup_fd(wakeup_fd)
+
+    def test_handlers_installed_without_self_pipe(self, manager, restore_signals, monkeypatch):
+        """If the wakeup fd is rejected the handlers still save, and no socket leaks"""
+        created = []
+        socketpair = socket.socketpair
+
+        def tracking_socketpair():
+            pair = socketpair()
+            created.extend(pair)
+            return pair
+
+        def reject_wakeup_fd(*args, **kwargs):
+            raise ValueError("the fd is not a socket")
+
+        monkeypatch.setattr(socket, "socketpair", tracking_socketpair)
+        monkeypatch.setattr(signal, "set_wakeup_fd", reject_wakeup_fd)
+        service = AutoSaveService(manager, enabled=False)
+        restore_signals.append(service)
+
+        assert signal.getsignal(signal.SIGINT) == service._signal_handler
+        assert service._sig_w is None
+        assert created and all(sock.fileno() == -1 for sock in created)
+
+    def test_signal_routed_through_self_pipe(self, manager, restore_signals):
+        """A SIGTERM lands on the socketpair and the watcher thread saves the session"""
+        session_id = manager.create_session("signalled")
+        service = AutoSaveService(manager, enabled=False)
+        restore_signals.append(service)
+        saved = threading.Event()
+        service.on_save(saved.set)
+
+        signal.raise_signal(signal.SIGTERM)
+
+        assert saved.wait(timeout=5)
+        assert (manager.paused_dir / f"{session_id}.nrs").exists()
+
+
+class TestSessionIndex:
+    """Test coalesced session index writes"""
+
+    def test_index_write_uses_snapshot(self, manager):
+        """The flush timer writes the index as it was when the save was scheduled"""
+        session_id = manager.create_session("indexed")
+        manager.rename_session(session_id, "renamed")
+        manager.index["sessions"][session_id]["name"] = "unsaved edit"
+
+        manager.flush()
+
+        index = json.loads((manager.sessions_dir / "session_index.json").read_bytes())
+        assert index["sessions"][session_id]["name"] == "renamed"
+
+    def test_queued_save_never_overwrites_newer_index(self, manager):
+        """A background save written after a newer index flush leaves the newer index"""
+        session_id = manager.create_session("ordering")
+        manager.flush()
+        gate = threading.Event()
+        manager._io_exec = ThreadPoolExecutor(max_workers=1)
+        manager._io_exec.submit(gate.wait)
+
+        queued = manager.save_session(wait=False)
+        manager.rename_session(session_id, "renamed")
+        manager.flush()
+        gate.set()
+        queued.result(timeout=5)
+
+        index = json.loads((manager.sessions_dir / "session_index.json").read_bytes())
+        assert index["sessions"][session_id]["name"] == "renamed"
+
+    def test_pending_index_never_overwrites_newer_save(self, manager):
+        """A save's index snapshot supersedes an older pending timer write"""
+        session_id = manager.create_session("superseded")
+        manager.save_session()
+
+        manager.flush()
+
+        index = json.loads((manager.sessions_dir / "session_index.json").read_bytes())
+        assert index["sessions"][session_id]["status"] == "paused"
+
+
+class TestStagedWrites:
+    """Test how session files are staged before being renamed into place"""
+
+    @pytest.mark.skipif(not getattr(os, "O_TMPFILE", 0), reason="O_TMPFILE not available")
+    def test_save_leaves_no_temp_files(self, manager, tmp_path):
+        """Unnamed O_TMPFILE staging only links a temp name once the data is written"""
+        session_id = manager.create_session("staged")
+        manager.save_session()
+        manager.flush()
+
+        assert not list(tmp_path.rglob("*.tmp"))
+        assert SessionManager(str(tmp_path)).load_session(session_id)["session"]["name"] == "staged"
+
+    def test_falls_back_when_tmpfile_link_fails(self, manager, tmp_path, monkeypatch):
+        """A filesystem that can't link O_TMPFILE inodes switches to NamedTemporaryFile"""
+        session_id = manager.create_session("fallback")
+
+        def no_link(*args, **kwargs):
+            raise OSError("linkat not supported")
+
+        monkeypatch.setattr(os, "link", no_link)
+        manager.update_session_state({"results": {"stage": "recon"}})
+        manager.save_session()
+        manager.flush()
+
+        assert manager._tmpfile_supported is False
+        assert not list(tmp_path.rglob("*.tmp"))
+        assert SessionManager(str(tmp_path)).load_session(session_id)["results"]["stage"] == "recon"
+
+
+@pytest.fixture
+def session_data(manager):
+    """Schema-valid session document"""
+    manager.create_session("serialized")
+    return manager.current_session_data
+
+
+class TestSessionSerializer:
+    """Test .nrs file encoding"""
+
+    def test_load_detects_gzip_by_magic(self, session_data, tmp_path):
+        """Compressed and plain files both load without being told which they are"""
+        serializer = SessionSerializer()
+        compressed = tmp_path / "compressed.nrs"
+        plain = tmp_path / "plain.nrs"
+        serializer.save_to_file(session_data, compressed, compress=True)
+        serializer.save_to_file(session_data, plain, compress=False)
+
+        assert compressed.read_bytes()[:2] == SessionSerializer.GZIP_MAGIC
+        assert plain.read_bytes()[:2] != SessionSerializer.GZIP_MAGIC
+        for path in (compressed, plain):
+            loaded = serializer.load_from_file(path, decompress=False)
+            assert loaded["session"]["id"] == session_data["session"]["id"]
+
+    def test_checkpoints_pruned_to_ring_size(self, session_data, tmp_path, monkeypatch):
+        """Stale checkpoints are pruned on first use and the oldest drops off each time"""
+        ticks = iter(datetime(2026, 1, 1) + timedelta(seconds=n) for n in range(100))
+        monkeypatch.setattr(session_serializer, "datetime", SimpleNamespace(now=lambda: next(ticks)))
+        monkeypatch.setattr(SessionSerializer, "MAX_CHECKPOINTS", 3)
+        checkpoint_dir = tmp_path / "checkpoints"
+        checkpoint_dir.mkdir()
+        for n in range(5):
+            (checkpoint_dir / f"checkpoint_20250101_00000{n}.nrs").write_bytes(b"")
+
+        serializer = SessionSerializer()
+        for _ in range(4):
+            serializer.create_checkpoint(session_data, checkpoint_dir)
+
+        assert sorted(p.name for p in checkpoint_dir.iterdir()) == [
+            "checkpoint_20260101_000001.nrs",
+            "checkpoint_20260101_000002.nrs",
+            "checkpoint_20260101_000003.nrs",
+        ]
+        restored = serializer.restore_from_checkpoint(checkpoint_dir)
+        assert restored["session"]["id"] == session_data["session"]["id"]
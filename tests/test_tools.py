@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Test suite for tool execution and output parsing
+"""
+
+import asyncio
+import functools
+import os
+import sys
+
+import pytest
+
+from modules.orchestration import execution_manager
+from modules.orchestration.data_models import ScanRequest, SessionContext
+from modules.orchestration.execution_manager import ExecutionManager
+from modules.recon.recon import ReconModule
+from modules.recon.recon_module import AdmissionController, EnhancedReconModule
+from modules.tools.base import BaseTool, ToolCategory, ToolMode
+from modules.tools.wrappers.nmap import NmapTool
+
+
+class _PrintTool(BaseTool):
+    """Emits a well-formed document larger than the test buffer"""
+
+    def __init__(self):
+        super().__init__("printer", "prints a document", ToolCategory.ANALYSIS, ToolMode.DEFENSIVE)
+
+    def validate_input(self, input_data):
+        return True
+
+    def build_command(self, input_data):
+        return [sys.executable, "-c", "print('<doc>' + 'x' * 4096 + '</doc>')"]
+
+    def parse_output(self, raw_output):
+        return {"well_formed": raw_output.startswith("<doc>") and raw_output.endswith("</doc>")}
+
+    def check_installed(self):
+        return True
+
+
+class _BigNmapTool(NmapTool):
+    """Emits a scan document larger than the test buffer"""
+
+    HOSTS = 200
+
+    def build_command(self, input_data):
+        script = (
+            "hosts = ''.join('<host><address addr=\"10.0.%d.%d\"/></host>' % divmod(n, 256) "
+            f"for n in range({self.HOSTS}))\n"
+            "print('<nmaprun>' + hosts + '</nmaprun>')"
+        )
+        return [sys.executable, "-c", script]
+
+
+@pytest.fixture
+def small_buffers(monkeypatch):
+    monkeypatch.setattr(
+        execution_manager, "_BoundedOutput",
+        functools.partial(execution_manager._BoundedOutput, limit=1024)
+    )
+
+
+class TestExecutionManager:
+    """Test bounded output capture"""
+
+    CONTEXT = SessionContext(session_id="s", mode=ToolMode.OFFENSIVE, target="localhost")
+
+    @pytest.mark.asyncio
+    async def test_truncated_nmap_output_parsed_from_spill_file(self, small_buffers):
+        """nmap's SAX parser reads the whole spilled document from disk"""
+        manager = ExecutionManager()
+        manager.tools["nmap"] = _BigNmapTool()
+
+        result = await manager.execute_tool(ScanRequest(tool_name="nmap", target="localhost"), self.CONTEXT)
+
+        assert result.status == "success"
+        assert len(result.structured_output["hosts"]) == _BigNmapTool.HOSTS
+        log_path = result.structured_output["raw_log_path"]
+        assert os.path.exists(log_path)
+
+        manager.close()
+        assert not os.path.exists(log_path)
+
+    @pytest.mark.asyncio
+    async def test_other_tools_parse_only_the_tail(self, small_buffers):
+        """Wrappers without a streaming parser never load the full spill file"""
+        manager = ExecutionManager()
+        tool = _PrintTool()
+        parsed = []
+        tool.parse_output = lambda raw_output: parsed.append(raw_output) or {}
+        manager.tools["printer"] = tool
+
+        result = await manager.execute_tool(ScanRequest(tool_name="printer", target="localhost"), self.CONTEXT)
+
+        assert parsed == [result.raw_output]
+        assert os.path.exists(result.structured_output["raw_log_path"])
+        manager.close()
+
+    @pytest.mark.asyncio
+    async def test_no_spill_directory_without_spill(self):
+        manager = ExecutionManager()
+        manager.tools["printer"] = _PrintTool()
+
+        result = await manager.execute_tool(ScanRequest(tool_name="printer", target="localhost"), self.CONTEXT)
+
+        assert result.structured_output["well_formed"] is True
+        assert manager._run_dir is None
+
+
+class TestNmapParsing:
+    """Test the SAX-based nmap XML parser"""
+
+    SCAN = (
+        '<nmaprun><host><status state="up"/><address addr="10.0.0.5" addrtype="ipv4"/>'
+        '<ports><port protocol="tcp" portid="22"><state state="open"/><service name="ssh"/></port>'
+        '<port protocol="tcp" portid="80"><state state="closed"/></port></ports></host></nmaprun>'
+    )
+
+    def test_parses_hosts_and_ports(self):
+        parsed = NmapTool().parse_output(self.SCAN)
+
+        assert parsed == {"hosts": [{
+            "ip": "10.0.0.5",
+            "ports": [
+                {"port": "22", "state": "open", "service": "ssh"},
+                {"port": "80", "state": "closed", "service": "unknown"},
+            ],
+        }]}
+
+    def test_malformed_output_reports_error(self):
+        parsed = NmapTool().parse_output(self.SCAN[:60])
+
+        assert parsed["error"] == "Failed to parse Nmap XML"
+
+    def test_entity_expansion_rejected(self):
+        """Banner-controlled XML must not be able to declare entities"""
+        pytest.importorskip("defusedxml")
+        payload = (
+            '<?xml version="1.0"?><!DOCTYPE nmaprun [<!ENTITY boom "boom">]>'
+            '<nmaprun><host><address addr="&boom;"/></host></nmaprun>'
+        )
+
+        assert "error" in NmapTool().parse_output(payload)
+
+
+class TestAdmissionController:
+    """Test the recon subprocess cap"""
+
+    @pytest.mark.asyncio
+    async def test_never_exceeds_limit(self):
+        slots = AdmissionController(2)
+        running = []
+        peak = 0
+
+        async def job():
+            nonlocal peak
+            async with slots:
+                running.append(None)
+                peak = max(peak, len(running))
+                await asyncio.sleep(0.01)
+                running.pop()
+
+        await asyncio.gather(*(job() for _ in range(8)))
+
+        assert peak == 2
+        assert slots.active == 0
+
+    @pytest.mark.asyncio
+    async def test_raising_limit_admits_waiters(self):
+        """Waiters blocked at the old cap are let in as soon as it is raised"""
+        slots = AdmissionController(1)
+        await slots.acquire()
+        waiters = [asyncio.create_task(slots.acquire()) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert not any(task.done() for task in waiters)
+
+        await slots.set_limit(3)
+        await asyncio.wait_for(asyncio.gather(*waiters), timeout=1)
+
+        assert slots.active == 3
+
+
+class TestReconStreaming:
+    """Test cleanup of streamed recon tool children"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(os.name != "posix", reason="uses a shell script as a fake tool")
+    @pytest.mark.parametrize("tool, stage", [
+        ("httpx", lambda recon: recon._run_httpx("a", ["a"])),
+        ("nmap", lambda recon: recon._run_nmap(["a"])),
+        ("subfinder", lambda recon: recon._run_command(["subfinder", "-d", "a"])),
+    ])
+    async def test_cancelled_tool_is_killed(self, tmp_path, monkeypatch, tool, stage):
+        """A stage timeout cancels the coroutine; the child must not outlive it"""
+        fake = tmp_path / tool
+        fake.write_text('#!/bin/sh\necho \'{"url": "http://a"}\'\nexec sleep 60\n')
+        fake.chmod(0o755)
+        recon = ReconModule(tmp_path)
+        recon._env["PATH"] = os.pathsep.join((str(tmp_path), recon._env["PATH"]))
+        spawned = []
+        create = asyncio.create_subprocess_exec
+
+        async def tracking_exec(*args, **kwargs):
+            proc = await create(*args, **kwargs)
+            spawned.append(proc)
+            return proc
+
+        monkeypatch.setattr(asyncio, "create_subprocess_exec", tracking_exec)
+        task = asyncio.create_task(stage(recon))
+        await asyncio.sleep(0.5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert spawned and spawned[0].returncode is not None
+
+
+class TestReconPipeline:
+    """Test the discovery -> httpx streaming pipeline"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(os.name != "posix", reason="uses cat as a stand-in tool")
+    async def test_timeout_starts_when_stdin_closes(self, tmp_path):
+        """A slow producer upstream doesn't use up the consumer's budget"""
+        recon = EnhancedReconModule(tmp_path)
+
+        async def slow_discovery():
+            for n in range(4):
+                await asyncio.sleep(0.1)
+                yield f"host{n}.example.com"
+
+        lines = [
+            line async for line in recon._stream_lines(["cat"], slow_discovery(), timeout=0.25)
+        ]
+
+        assert lines == [f"host{n}.example.com".encode() for n in range(4)]
+
+    @pytest.mark.asyncio
+    async def test_probe_does_not_starve_discovery(self, tmp_path):
+        """httpx waiting on discovery must not hold the slot discovery needs"""
+        recon = EnhancedReconModule(tmp_path)
+        await recon._proc_slots.set_limit(1)
+        recon._httpx_cmd = [
+            sys.executable, "-c",
+            "import json, sys\nfor line in sys.stdin: print(json.dumps({'url': line.strip()}))",
+        ]
+
+        async def discovered():
+            async for line in recon._stream_lines([sys.executable, "-c", "print('a.example.com')"]):
+                yield line.decode()
+
+        services = await asyncio.wait_for(recon._probe(discovered()), timeout=10)
+
+        assert [service["url"] for service in services] == ["a.example.com"]
+
+    def test_httpx_threads_capped_by_probe_limit(self, tmp_path):
+        recon = EnhancedReconModule(tmp_path)
+        recon.config["httpx"]["threads"] = 500
+
+        assert recon._httpx_threads() == EnhancedReconModule.MAX_HTTP_PROBES